@@ -1,14 +1,18 @@
 import streamlit as st
-import requests
-import pandas as pd
 import os
-import json
-import time
-import openai
-import re
+import queue
+
+from sb_char.auth import AuthConfig
+from sb_char.cache import MemoryBackend, RateLimiter, cache_key, get_backend
+from sb_char.pipeline import ReportConfig, ReportError, configure_logging
+from sb_char.report import ReportStore
+
+# The report runner and its SDK clients (httpx, openai) are created lazily in
+# get_report_runner so the sign-in path stays cheap on a cold session.
 
 # --- SETUP ---
 st.set_page_config(page_title="Player Character Measurement", layout="wide")
+configure_logging()
 
 # --- CUSTOM THEME ---
 primary_color = "#00c2cb"  # Light blue/teal from logo
@@ -308,6 +312,69 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
+# --- CONFIGURATION ---
+SESSION_COOKIE = "sb_char_session"
+
+def read_secret(name, default=None):
+    """Read a value from st.secrets, falling back to `default` without a secrets file"""
+    try:
+        return st.secrets[name]
+    except Exception:
+        return default
+
+@st.cache_resource
+def get_auth():
+    """Hashed credentials and session-signing secret, read once per process"""
+    # Fallback for local development without secrets
+    credentials = dict(read_secret("credentials", {"username": "admin", "password": "password"}))
+    return AuthConfig.from_credentials(credentials, session_secret=read_secret("SESSION_SECRET"))
+
+@st.cache_resource
+def get_report_config():
+    """Pipeline config with the API keys resolved once per process"""
+    return ReportConfig(
+        openai_api_key=read_secret("OPENAI_API_KEY"),
+        searchapi_key=read_secret("SEARCHAPI_API_KEY"),
+        cache=get_cache()
+    )
+
+def request_is_https():
+    """Whether the browser reached us over HTTPS, directly or through the proxy"""
+    forwarded = st.context.headers.get("X-Forwarded-Proto", "")
+    return forwarded.split(",")[0].strip().lower() == "https"
+
+def set_session_cookie(token, max_age):
+    """Store the signed session token in a browser cookie so reloads and new tabs skip sign-in.
+
+    An empty token with max_age=0 deletes the cookie. Streamlit cannot set
+    HttpOnly cookies, so the cookie is SameSite=Strict and sign-out revokes the
+    token server-side as well. It is marked Secure when the request came over
+    HTTPS (X-Forwarded-Proto, set by deploy/nginx.conf); browsers drop Secure
+    cookies on plain-HTTP origins, which would make every visit sign in again.
+    """
+    import streamlit.components.v1 as components
+    secure = "; Secure" if request_is_https() else ""
+    components.html(
+        f"<script>window.parent.document.cookie = "
+        f"'{SESSION_COOKIE}={token}; path=/; max-age={max_age}{secure}; SameSite=Strict';</script>",
+        height=0
+    )
+
+def revocation_key(token):
+    """Cache key marking `token` as signed out; the prefix keeps it out of cache eviction"""
+    return f"revoked-session:{cache_key(token)}"
+
+def revoke_session(token):
+    """Reject `token` in every worker until it would have expired anyway"""
+    get_cache().set(revocation_key(token), True, ttl=get_auth().session_ttl)
+
+def session_user(token):
+    """User of a valid, unrevoked session token, otherwise None"""
+    user = get_auth().verify_token(token)
+    if user is None or get_cache().get(revocation_key(token)):
+        return None
+    return user
+
 # --- SIGN IN FLOW ---
 def show_signin():
     st.session_state["authenticated"] = False
@@ -343,18 +410,15 @@ def show_signin():
             submitted = st.form_submit_button("SIGN IN")
 
             if submitted:
-                # Use appropriate credential checking based on your setup
-                try:
-                    if user == st.secrets["credentials"]["username"] and pw == st.secrets["credentials"]["password"]:
-                        st.session_state["authenticated"] = True
-                    else:
-                        st.error("Invalid credentials. Please try again.")
-                except Exception:
-                    # Fallback for local development without secrets
-                    if user == "admin" and pw == "password":
-                        st.session_state["authenticated"] = True
-                    else:
-                        st.error("Invalid credentials. Please try again.")
+                auth = get_auth()
+                if auth.check_password(user, pw):
+                    st.session_state["authenticated"] = True
+                    st.session_state["user"] = user
+                    st.session_state["session_token"] = auth.issue_token(user)
+                    st.session_state["session_cookie_pending"] = True
+                    st.rerun()
+                else:
+                    st.error("Invalid credentials. Please try again.")
 
 # Helper function to get color class based on score
 def get_score_color(score):
@@ -367,391 +431,100 @@ def get_score_color(score):
     else:
         return "green"
 
-# --- FUNCTIONS ---
-def search_player_info(player_name, num_results=50):
-    """Search for information about an NFL player using SearchAPI"""
-    SEARCH_URL = "https://www.searchapi.io/api/v1/search"
-    
-    # General info search
-    search_results = []
-    
-    try:
-        # General info search
-        general_params = {
-            "engine": "google",
-            "q": f"{player_name} nfl player stats career info",
-            "num": num_results
-        }
-        
-        general_response = requests.get(
-            SEARCH_URL, 
-            params=general_params, 
-            headers={"Authorization": f"Bearer {st.session_state['searchapi_key']}"}
-        )
-        
-        if general_response.status_code == 200:
-            general_data = general_response.json()
-            for result in general_data.get("organic_results", []):
-                search_results.append({
-                    'title': result.get("title", "No title"),
-                    'link': result.get("link", ""),
-                    'snippet': result.get("snippet", "No snippet"),
-                    'source': 'general'
-                })
-        
-        # News search
-        news_params = {
-            "engine": "google",
-            "q": f"{player_name} nfl news recent",
-            "num": num_results,
-            "tbm": "nws"  # News search
-        }
-        
-        news_response = requests.get(
-            SEARCH_URL, 
-            params=news_params, 
-            headers={"Authorization": f"Bearer {st.session_state['searchapi_key']}"}
-        )
-        
-        if news_response.status_code == 200:
-            news_data = news_response.json()
-            for result in news_data.get("organic_results", []):
-                search_results.append({
-                    'title': result.get("title", "No title"),
-                    'link': result.get("link", ""),
-                    'snippet': result.get("snippet", "No snippet"),
-                    'source': 'news'
-                })
-        
-        return search_results
-    except Exception as e:
-        st.error(f"Error gathering information: {str(e)}")
-        return []
-
-def analyze_with_openai(player_name, search_results, max_retries=2):
-    """Analyze player perception using OpenAI with automatic retries"""
-    # Set OpenAI API key
-    openai.api_key = st.session_state["openai_api_key"]
-    
-    # Format the search results for the LLM
-    formatted_articles = []
-    
-    for idx, result in enumerate(search_results):
-        formatted_articles.append(
-            f"Article {idx+1} ({result.get('source', 'unknown')}):\n"
-            f"Title: {result.get('title', 'No title')}\n"
-            f"Content: {result.get('snippet', 'No content')}\n"
-        )
-    
-    # Join formatted results with newlines
-    articles_text = "\n\n".join(formatted_articles)
-    
-    # Create the prompt for the LLM
-    prompt = f"""
-You are analyzing news coverage and information for NFL player {player_name}. Given the following articles, create a detailed character report.
-
-Articles:
-{articles_text}
-
-Your character report must follow this EXACT format for proper parsing:
-
-1. CATEGORY_SCORES
-[Provide scores from 1-100 for EXACTLY 5 key categories of player perception. Use only these five categories: "On-Field Performance", "Leadership", "Team Relationship", "Public Image", and "Off-Field Conduct". For each category, show a score and a brief explanation on the SAME line. Format precisely as: "Category Name: Score - Brief explanation". For example: "Leadership: 85 - Demonstrates excellent leadership qualities both on and off the field."]
+# Helper function to build the sources table from the report's source columns
+def build_sources_table(sources, source=None):
+    """Deduplicate sources by link and return them as columns, optionally filtered by source type"""
+    table = {"Title": [], "Source": [], "Link": [], "Snippet": []}
+    seen_links = set()
+    for title, link, snippet, kind in zip(sources.titles, sources.links, sources.snippets, sources.kinds):
+        if source and kind != source:
+            continue
+        if link:
+            if link in seen_links:
+                continue
+            seen_links.add(link)
+        table["Title"].append(title)
+        table["Source"].append(kind)
+        table["Link"].append(link or None)
+        table["Snippet"].append(snippet)
+    return table
 
-2. EXECUTIVE_SUMMARY
-[Write a 1-2 paragraph summary that integrates insights from all five categories. Highlight key strengths and areas for improvement based on the category scores. Make connections between different categories where appropriate.]
+# --- CLIENTS AND SHARED CACHE ---
+REPORT_RATE_LIMIT = 10  # reports per user per window
+REPORT_RATE_WINDOW = 60  # seconds
+# Per-process memory budget for retained reports. With the in-process memory://
+# cache backend, half of it bounds that cache and half the report store.
+PROCESS_MEMORY_BUDGET = int(os.environ.get("SB_CHAR_REPORT_MEMORY_MB", "256")) * 1024 * 1024
 
-3. PERFORMANCE_DETAILS
-[Provide detailed analysis of the player's on-field performance perception with specific evidence and examples.]
+@st.cache_resource
+def get_cache():
+    """Cache backend shared by all worker processes, selected by SB_CHAR_CACHE_URL"""
+    return get_backend(memory_max_bytes=PROCESS_MEMORY_BUDGET // 2)
 
-4. LEADERSHIP_DETAILS
-[Provide detailed analysis of the player's leadership qualities with specific evidence and examples.]
+@st.cache_resource
+def get_rate_limiter():
+    """Per-user report rate limiter whose counters live in the shared cache"""
+    return RateLimiter(get_cache(), limit=REPORT_RATE_LIMIT, window=REPORT_RATE_WINDOW)
 
-5. TEAM_RELATIONSHIP_DETAILS
-[Provide detailed analysis of the player's relationship with team members and organization with specific evidence and examples.]
+@st.cache_resource
+def get_report_store():
+    """Process-wide LRU of compact reports; sessions only keep the store key"""
+    in_process_cache = isinstance(get_cache(), MemoryBackend)
+    return ReportStore(max_bytes=PROCESS_MEMORY_BUDGET // 2 if in_process_cache else PROCESS_MEMORY_BUDGET)
 
-6. PUBLIC_IMAGE_DETAILS
-[Provide detailed analysis of the player's public and media perception with specific evidence and examples.]
+def get_session_report():
+    """Compact report for this session, or None if the store evicted it"""
+    entry = st.session_state.get("report")
+    return None if entry is None else get_report_store().get(entry["key"])
 
-7. CONDUCT_DETAILS
-[Provide detailed analysis of the player's off-field conduct and character with specific evidence and examples.]
+@st.cache_resource
+def get_report_runner():
+    """Report pipeline on a background event loop shared by all sessions, created on the first report"""
+    from sb_char.runner import ReportRunner
+    return ReportRunner(get_report_config())
 
-Make sure to use the exact section headers as shown above, as they will be used for parsing the response.
-"""
-    
-    retries = 0
-    while retries <= max_retries:
-        try:
-            # Call OpenAI API
-            response = openai.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert NFL analyst specializing in player perception and reputation analysis."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.5
-            )
-            
-            analysis_text = response.choices[0].message.content
-            
-            # Parse the sections
-            sections = {}
-            current_section = None
-            section_content = []
-            
-            for line in analysis_text.split('\n'):
-                if line.startswith('1. CATEGORY_SCORES'):
-                    current_section = 'CATEGORY_SCORES'
-                    continue
-                elif line.startswith('2. EXECUTIVE_SUMMARY'):
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = 'EXECUTIVE_SUMMARY'
-                    section_content = []
-                    continue
-                elif line.startswith('3. PERFORMANCE_DETAILS'):
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = 'PERFORMANCE_DETAILS'
-                    section_content = []
-                    continue
-                elif line.startswith('4. LEADERSHIP_DETAILS'):
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = 'LEADERSHIP_DETAILS'
-                    section_content = []
-                    continue
-                elif line.startswith('5. TEAM_RELATIONSHIP_DETAILS'):
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = 'TEAM_RELATIONSHIP_DETAILS'
-                    section_content = []
-                    continue
-                elif line.startswith('6. PUBLIC_IMAGE_DETAILS'):
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = 'PUBLIC_IMAGE_DETAILS'
-                    section_content = []
-                    continue
-                elif line.startswith('7. CONDUCT_DETAILS'):
-                    if current_section:
-                        sections[current_section] = '\n'.join(section_content).strip()
-                    current_section = 'CONDUCT_DETAILS'
-                    section_content = []
-                    continue
-                elif current_section:
-                    section_content.append(line)
-            
-            # Add the last section
-            if current_section and section_content:
-                sections[current_section] = '\n'.join(section_content).strip()
-            
-            # Extract category scores
-            category_scores = {
-                "On-Field Performance": {"score": 0, "explanation": ""},
-                "Leadership": {"score": 0, "explanation": ""},
-                "Team Relationship": {"score": 0, "explanation": ""},
-                "Public Image": {"score": 0, "explanation": ""},
-                "Off-Field Conduct": {"score": 0, "explanation": ""}
-            }
-            
-            if 'CATEGORY_SCORES' in sections:
-                category_lines = sections['CATEGORY_SCORES'].split('\n')
-                for line in category_lines:
-                    line = line.strip()
-                    if line and ":" in line:
-                        # Try to extract category, score and explanation
-                        category_match = re.match(r'([^:]+):\s*(\d+)\s*-\s*(.+)', line)
-                        if category_match:
-                            category = category_match.group(1).strip()
-                            score = int(category_match.group(2))
-                            explanation = category_match.group(3).strip()
-                            
-                            # Match to our predefined categories (fuzzy matching)
-                            if "field" in category.lower() and ("performance" in category.lower() or "skill" in category.lower()):
-                                category_scores["On-Field Performance"]["score"] = score
-                                category_scores["On-Field Performance"]["explanation"] = explanation
-                            elif "leadership" in category.lower() or "lead" in category.lower():
-                                category_scores["Leadership"]["score"] = score
-                                category_scores["Leadership"]["explanation"] = explanation
-                            elif "team" in category.lower() or "relationship" in category.lower() or "teammate" in category.lower():
-                                category_scores["Team Relationship"]["score"] = score
-                                category_scores["Team Relationship"]["explanation"] = explanation
-                            elif "public" in category.lower() or "image" in category.lower() or "media" in category.lower():
-                                category_scores["Public Image"]["score"] = score
-                                category_scores["Public Image"]["explanation"] = explanation
-                            elif "conduct" in category.lower() or "off-field" in category.lower() or "character" in category.lower():
-                                category_scores["Off-Field Conduct"]["score"] = score
-                                category_scores["Off-Field Conduct"]["explanation"] = explanation
-            
-            # Set default scores for any missing categories
-            for category in category_scores:
-                if category_scores[category]["score"] == 0:
-                    category_scores[category]["score"] = 65
-                    category_scores[category]["explanation"] = f"Default score for {category}."
-            
-            # Check if any of the detail sections is empty or "No details available"
-            details = {
-                "performance": sections.get('PERFORMANCE_DETAILS', 'No details available.'),
-                "leadership": sections.get('LEADERSHIP_DETAILS', 'No details available.'),
-                "team_relationship": sections.get('TEAM_RELATIONSHIP_DETAILS', 'No details available.'),
-                "public_image": sections.get('PUBLIC_IMAGE_DETAILS', 'No details available.'),
-                "conduct": sections.get('CONDUCT_DETAILS', 'No details available.')
-            }
-            
-            # Check if results are valid or need retry
-            missing_details = sum(1 for detail in details.values() if detail == 'No details available.')
-            if missing_details >= 3 and retries < max_retries:
-                # If too many sections are missing, retry
-                retries += 1
-                time.sleep(1)  # Short delay before retry
+# --- FUNCTIONS ---
+def process_player_report(player_name):
+    """Generate the player report through the async pipeline, showing its progress"""
+    runner = get_report_runner()
+    
+    # Progress events arrive on the pipeline's loop thread; relay them to this script
+    events = queue.SimpleQueue()
+    future = runner.submit(player_name, on_progress=events.put)
+    
+    progress = st.empty()
+    with st.spinner(f"Generating comprehensive report for {player_name}..."):
+        while True:
+            try:
+                event = events.get(timeout=0.1)
+            except queue.Empty:
+                if future.done():
+                    break
                 continue
-            
-            # Calculate overall score as the average of category scores
-            overall_score = round(sum(category_scores[category]["score"] for category in category_scores) / len(category_scores))
-            
-            # Generate score explanation based on average score
-            score_explanation = f"Average of all five character categories: {', '.join(category_scores.keys())}."
-                    
-            return {
-                'overall_score': overall_score,
-                'score_explanation': score_explanation,
-                'category_scores': category_scores,
-                'executive_summary': sections.get('EXECUTIVE_SUMMARY', ''),
-                'details': details,
-                'raw_data': search_results
-            }
-                
-        except Exception as e:
-            if retries < max_retries:
-                retries += 1
-                time.sleep(1)  # Short delay before retry
-            else:
-                return {
-                    'error': f"Analysis failed after {max_retries + 1} attempts: {str(e)}"
-                }
-    
-    # If we reach here, all retries have failed
-    return {
-        'error': f"Analysis failed after {max_retries + 1} attempts."
-    }
-
-# Function to process player report with built-in retries
-def process_player_report(player_name, max_retries=2):
-    """Process the full player report with automatic retries"""
-    
-    # Track retry attempts
-    retry_count = 0
-    
-    while retry_count <= max_retries:
-        with st.spinner(f"Generating comprehensive report for {player_name}{' (Retry attempt: ' + str(retry_count) + ')' if retry_count > 0 else ''}..."):
-            # Step 1: Search for player information
-            search_results = search_player_info(player_name)
-            
-            if not search_results:
-                # If search fails, increment retry count and try again if possible
-                if retry_count < max_retries:
-                    retry_count += 1
-                    time.sleep(1)
-                    continue
-                else:
-                    st.error(f"Unable to find sufficient information for {player_name}. Please check the spelling or try another player.")
-                    return None
-            
-            # Step 2: Analyze the search results with OpenAI (with its own retry mechanism)
-            analysis_result = analyze_with_openai(player_name, search_results)
-            
-            if "error" in analysis_result:
-                # If analysis fails, increment retry count and try again if possible
-                if retry_count < max_retries:
-                    retry_count += 1
-                    time.sleep(1)
-                    continue
-                else:
-                    st.error(f"Error generating report: {analysis_result['error']}")
-                    return None
-            
-            # Check for incomplete results
-            details = analysis_result['details']
-            missing_details = sum(1 for detail in details.values() if detail == 'No details available.')
-            
-            if missing_details >= 3:
-                # If too many sections are missing, retry if possible
-                if retry_count < max_retries:
-                    retry_count += 1
-                    time.sleep(1)
-                    continue
-            
-            # If we reach here, we have a successful result or have used all retries
-            return analysis_result
+            progress.caption(event.message)
+    progress.empty()
     
-    # If we reach here, all retries have failed
-    st.error("Unable to generate a complete report after multiple attempts. Please try again.")
-    return None
-
-# --- AUTHENTICATION CHECK ---
-# Check authentication state
-if "authenticated" not in st.session_state:
-    st.session_state["authenticated"] = False
-
-# Handle sign in flow
-if not st.session_state["authenticated"]:
-    show_signin()
-    st.stop()
-
-# --- INITIALIZE API KEYS SILENTLY ---
-if "openai_api_key" not in st.session_state:
-    # Try to get from secrets
     try:
-        st.session_state["openai_api_key"] = st.secrets["OPENAI_API_KEY"]
-    except Exception:
-        st.session_state["openai_api_key"] = None
+        return future.result()
+    except ReportError as e:
+        st.error(str(e))
+        return None
 
-if "searchapi_key" not in st.session_state:
-    # Try to get from secrets
-    try:
-        st.session_state["searchapi_key"] = st.secrets["SEARCHAPI_API_KEY"]
-    except Exception:
-        st.session_state["searchapi_key"] = None
-
-# Silently check if API keys are available
-api_keys_available = (st.session_state["openai_api_key"] is not None and 
-                     st.session_state["searchapi_key"] is not None)
-
-# --- HEADER WITH LOGO ---
-col1, col2 = st.columns([1, 6])
-with col1:
-    st.image("char_img.png", width=80)
-with col2:
-    st.title("Player Character Measurement")
-
-# --- MAIN APP ---
-player_name = st.text_input("Enter Player Name", "Patrick Mahomes")
-
-analyze_col1, analyze_col2, analyze_col3 = st.columns([1, 2, 1])
-with analyze_col2:
-    analyze_button = st.button("Generate Report", type="primary", use_container_width=True)
-
-# Only process analysis when button is clicked
-if analyze_button:
-    if not api_keys_available:
-        st.error("System configuration error. Please contact technical support.")
-        st.stop()
-    
-    # Use the new process_player_report function with automatic retries
-    analysis_result = process_player_report(player_name, max_retries=2)
-    
-    # If analysis failed after all retries, stop execution
-    if analysis_result is None:
-        st.stop()
-    
-    # Display results
-    st.markdown(f"## Player Report: {player_name}")
+# --- REPORT RENDERING ---
+# Each results area is an isolated fragment that reads the report from session
+# state, so interacting with one of them only redraws that fragment and never
+# re-runs the page or re-requests the report.
+@st.fragment
+def render_score_header():
+    """Render the overall character score bubble and its explanation"""
+    report = get_session_report()
+    if report is None:
+        return
     
     # Display overall character score
-    overall_score = analysis_result['overall_score']
+    overall_score = report.overall_score
     overall_color = get_score_color(overall_score)
-    
+
     col1, col2 = st.columns([1, 3])
     with col1:
         # Create a circular score display with the appropriate color
@@ -768,67 +541,57 @@ if analyze_button:
         )
     with col2:
         st.markdown("<div class='score-explanation'>", unsafe_allow_html=True)
-        st.markdown(f"**Why this score:** {analysis_result['score_explanation']}")
+        st.markdown(f"**Why this score:** {report.score_explanation}")
         st.markdown("</div>", unsafe_allow_html=True)
+
+@st.fragment
+def render_report_body():
+    """Render the executive summary and the category tabs"""
+    report = get_session_report()
+    if report is None:
+        return
     
     # Display analysis in a clean container
     st.markdown("<div class='analysis-container'>", unsafe_allow_html=True)
-    
+
     # Executive Summary at the top
     st.markdown("### Executive Summary")
     st.markdown("<div class='executive-summary'>", unsafe_allow_html=True)
-    st.markdown(analysis_result['executive_summary'])
+    st.markdown(report.executive_summary)
     st.markdown("</div>", unsafe_allow_html=True)
-    
+
     # Prepare information for tabs
-    tab_data = [
-        {
-            "name": "On-Field Performance", 
-            "score": analysis_result['category_scores']["On-Field Performance"]["score"],
-            "explanation": analysis_result['category_scores']["On-Field Performance"]["explanation"],
-            "content": analysis_result['details']['performance']
-        },
-        {
-            "name": "Leadership", 
-            "score": analysis_result['category_scores']["Leadership"]["score"],
-            "explanation": analysis_result['category_scores']["Leadership"]["explanation"],
-            "content": analysis_result['details']['leadership']
-        },
-        {
-            "name": "Team Relations", 
-            "score": analysis_result['category_scores']["Team Relationship"]["score"],
-            "explanation": analysis_result['category_scores']["Team Relationship"]["explanation"],
-            "content": analysis_result['details']['team_relationship']
-        },
-        {
-            "name": "Public Image", 
-            "score": analysis_result['category_scores']["Public Image"]["score"],
-            "explanation": analysis_result['category_scores']["Public Image"]["explanation"],
-            "content": analysis_result['details']['public_image']
-        },
-        {
-            "name": "Off-Field Conduct", 
-            "score": analysis_result['category_scores']["Off-Field Conduct"]["score"],
-            "explanation": analysis_result['category_scores']["Off-Field Conduct"]["explanation"],
-            "content": analysis_result['details']['conduct']
-        }
-    ]
-    
+    tab_data = []
+    for name, category, detail_key in [
+        ("On-Field Performance", "On-Field Performance", "performance"),
+        ("Leadership", "Leadership", "leadership"),
+        ("Team Relations", "Team Relationship", "team_relationship"),
+        ("Public Image", "Public Image", "public_image"),
+        ("Off-Field Conduct", "Off-Field Conduct", "conduct")
+    ]:
+        score, explanation = report.category(category)
+        tab_data.append({
+            "name": name,
+            "score": score,
+            "explanation": explanation,
+            "content": report.detail(detail_key)
+        })
+
     # Get color classes for each tab
     tab_colors = [get_score_color(tab["score"]) for tab in tab_data]
-    
+
     # Create colored tabs with scores
     tab_labels = [f"{tab['name']} ({tab['score']})" for tab in tab_data]
-    
+
     # Create the tabs with streamlit - no custom HTML injection
     tabs = st.tabs(tab_labels)
-    
+
     # Fill each tab with its content
     for i, tab in enumerate(tabs):
         with tab:
             data = tab_data[i]
             color = tab_colors[i]
-            
+
             # Display score and explanation at top of tab
             st.markdown(f"""
             <div class="category-header">
@@ -836,17 +599,152 @@ if analyze_button:
                 <span><strong>{data['explanation']}</strong></span>
             </div>
             """, unsafe_allow_html=True)
-            
+
             # Display the detailed content
             st.markdown(data['content'])
-    
+
     st.markdown("</div>", unsafe_allow_html=True)
+
+@st.fragment
+def render_sources():
+    """Render the sources used for the report as a single table"""
+    report = get_session_report()
+    if report is None:
+        return
+    
+    # Sources at the bottom for technical staff; the table is only built and
+    # sent to the browser once the toggle is switched on
+    if not st.toggle("Show sources and references", key="show_sources"):
+        return
+    
+    st.markdown("### Information Sources")
+    source_filter = st.radio("Source type", ["All", "General", "News"], horizontal=True, key="sources_filter")
+    table = build_sources_table(
+        report.sources,
+        source=None if source_filter == "All" else source_filter.lower()
+    )
+    st.caption(f"{len(table['Title'])} unique sources")
+    
+    # One virtualized dataframe instead of a markdown element per source
+    st.dataframe(
+        table,
+        column_config={
+            "Link": st.column_config.LinkColumn("Link", display_text="Open"),
+            "Snippet": st.column_config.TextColumn("Snippet", width="large")
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+def render_memory_gauge():
+    """Sidebar gauge of the memory held for this session, the report store and an in-process cache"""
+    store = get_report_store()
+    stats = store.stats()
+    entry = st.session_state.get("report")
+    session_bytes = store.nbytes(entry["key"]) if entry else 0
+    
+    with st.sidebar:
+        st.metric("Session report memory", f"{session_bytes / 1024:.1f} KB")
+        st.progress(
+            min(stats["bytes"] / stats["max_bytes"], 1.0),
+            text=f"Report store: {stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MB ({stats['reports']} reports)"
+        )
+        cache = get_cache()
+        if isinstance(cache, MemoryBackend):
+            cache_stats = cache.stats()
+            st.progress(
+                min(cache_stats["bytes"] / cache_stats["max_bytes"], 1.0),
+                text=f"Cache: {cache_stats['bytes'] / 2**20:.1f} of {cache_stats['max_bytes'] / 2**20:.0f} MB ({cache_stats['entries']} entries)"
+            )
+
+# --- AUTHENTICATION CHECK ---
+# Check authentication state once per session; reconnecting analysts present
+# a signed session cookie and skip the sign-in form
+if "authenticated" not in st.session_state:
+    token = st.context.cookies.get(SESSION_COOKIE)
+    user = session_user(token)
+    st.session_state["authenticated"] = user is not None
+    if user is not None:
+        st.session_state["user"] = user
+        st.session_state["session_token"] = token
+
+# Handle sign in flow
+if not st.session_state["authenticated"]:
+    # Delete the cookie of a session that just signed out
+    if st.session_state.pop("clear_session_cookie", False):
+        set_session_cookie("", 0)
+    show_signin()
+    st.stop()
+
+# Persist a fresh sign-in so the next reload or tab reuses it
+if st.session_state.pop("session_cookie_pending", False):
+    set_session_cookie(st.session_state["session_token"], get_auth().session_ttl)
+
+# Sign out revokes the token everywhere and clears the cookie
+if st.sidebar.button("Sign out"):
+    token = st.session_state.pop("session_token", None)
+    if token:
+        revoke_session(token)
+    st.session_state.pop("user", None)
+    st.session_state.pop("report", None)
+    st.session_state["authenticated"] = False
+    st.session_state["clear_session_cookie"] = True
+    st.rerun()
+
+# Silently check if API keys are available
+api_keys_available = get_report_config().api_keys_available
+
+# --- HEADER WITH LOGO ---
+col1, col2 = st.columns([1, 6])
+with col1:
+    st.image("char_img.png", width=80)
+with col2:
+    st.title("Player Character Measurement")
+
+# --- MAIN APP ---
+# Inputs live in a form so typing a name does not trigger a rerun
+with st.form("report_form", border=False):
+    player_name = st.text_input("Enter Player Name", "Patrick Mahomes")
     
-    # Sources at the bottom in an expander for technical staff
-    with st.expander("Sources and References", expanded=False):
-        st.markdown("### Information Sources")
-        for i, result in enumerate(analysis_result['raw_data']):
-            st.markdown(f"**Source {i+1}:** {result.get('title', 'No title')}")
-            if 'link' in result and result['link']:
-                st.markdown(f"[Link]({result['link']})")
-            st.markdown("---")
\ No newline at end of file
+    analyze_col1, analyze_col2, analyze_col3 = st.columns([1, 2, 1])
+    with analyze_col2:
+        analyze_button = st.form_submit_button("Generate Report", type="primary", use_container_width=True)
+
+# Only process analysis when button is clicked
+if analyze_button:
+    if not api_keys_available:
+        st.error("System configuration error. Please contact technical support.")
+        st.stop()
+    
+    # Rate-limit counters are shared, so the limit holds across worker processes
+    if not get_rate_limiter().allow(st.session_state.get("user", "anonymous")):
+        st.error("Too many reports requested. Please wait a minute and try again.")
+        st.stop()
+    
+    # Generate the report through the async pipeline (retries are built in)
+    analysis_result = process_player_report(player_name)
+    
+    # If analysis failed after all retries, stop execution
+    if analysis_result is None:
+        st.stop()
+    
+    # Keep only the store key in session state; the compact report is shared
+    st.session_state["report"] = {
+        "player_name": player_name,
+        "key": get_report_store().put(player_name, analysis_result)
+    }
+
+# Display results for the last generated report
+if st.session_state.get("report"):
+    if get_session_report() is None:
+        # Evicted under memory pressure; generating it again reuses the cached report
+        # or search results if they are still in the (also bounded) cache
+        del st.session_state["report"]
+        st.info("This report was cleared to free memory. Generate it again to reload it.")
+    else:
+        st.markdown(f"## Player Report: {st.session_state['report']['player_name']}")
+        render_score_header()
+        render_report_body()
+        render_sources()
+
+render_memory_gauge()
@@ -0,0 +1,18 @@
+"""Shared, UI-independent building blocks for the Player Character Measurement app."""
+from .pipeline import (
+    ProgressEvent,
+    ReportConfig,
+    ReportError,
+    configure_logging,
+    generate_report,
+    generate_reports,
+)
+
+__all__ = [
+    "ProgressEvent",
+    "ReportConfig",
+    "ReportError",
+    "configure_logging",
+    "generate_report",
+    "generate_reports",
+]
@@ -0,0 +1,157 @@
+"""Prompt construction and response parsing for character reports."""
+import re
+
+SYSTEM_PROMPT = "You are an expert NFL analyst specializing in player perception and reputation analysis."
+
+MISSING_DETAILS = "No details available."
+
+CATEGORIES = ["On-Field Performance", "Leadership", "Team Relationship", "Public Image", "Off-Field Conduct"]
+
+# Section headers in the order the model is asked to produce them
+SECTIONS = [
+    "CATEGORY_SCORES",
+    "EXECUTIVE_SUMMARY",
+    "PERFORMANCE_DETAILS",
+    "LEADERSHIP_DETAILS",
+    "TEAM_RELATIONSHIP_DETAILS",
+    "PUBLIC_IMAGE_DETAILS",
+    "CONDUCT_DETAILS",
+]
+
+PROMPT_TEMPLATE = """
+You are analyzing news coverage and information for NFL player {player_name}. Given the following articles, create a detailed character report.
+
+Articles:
+{articles_text}
+
+Your character report must follow this EXACT format for proper parsing:
+
+1. CATEGORY_SCORES
+[Provide scores from 1-100 for EXACTLY 5 key categories of player perception. Use only these five categories: "On-Field Performance", "Leadership", "Team Relationship", "Public Image", and "Off-Field Conduct". For each category, show a score and a brief explanation on the SAME line. Format precisely as: "Category Name: Score - Brief explanation". For example: "Leadership: 85 - Demonstrates excellent leadership qualities both on and off the field."]
+
+2. EXECUTIVE_SUMMARY
+[Write a 1-2 paragraph summary that integrates insights from all five categories. Highlight key strengths and areas for improvement based on the category scores. Make connections between different categories where appropriate.]
+
+3. PERFORMANCE_DETAILS
+[Provide detailed analysis of the player's on-field performance perception with specific evidence and examples.]
+
+4. LEADERSHIP_DETAILS
+[Provide detailed analysis of the player's leadership qualities with specific evidence and examples.]
+
+5. TEAM_RELATIONSHIP_DETAILS
+[Provide detailed analysis of the player's relationship with team members and organization with specific evidence and examples.]
+
+6. PUBLIC_IMAGE_DETAILS
+[Provide detailed analysis of the player's public and media perception with specific evidence and examples.]
+
+7. CONDUCT_DETAILS
+[Provide detailed analysis of the player's off-field conduct and character with specific evidence and examples.]
+
+Make sure to use the exact section headers as shown above, as they will be used for parsing the response.
+"""
+
+
+def build_prompt(player_name, search_results):
+    """Format the search results into the report prompt for the LLM"""
+    formatted_articles = []
+    for idx, result in enumerate(search_results):
+        formatted_articles.append(
+            f"Article {idx+1} ({result.get('source', 'unknown')}):\n"
+            f"Title: {result.get('title', 'No title')}\n"
+            f"Content: {result.get('snippet', 'No content')}\n"
+        )
+    return PROMPT_TEMPLATE.format(player_name=player_name, articles_text="\n\n".join(formatted_articles))
+
+
+def split_sections(analysis_text):
+    """Split the model response into its numbered sections"""
+    headers = {f"{i}. {name}": name for i, name in enumerate(SECTIONS, start=1)}
+    sections = {}
+    current_section = None
+    section_content = []
+
+    for line in analysis_text.split('\n'):
+        header = next((name for prefix, name in headers.items() if line.startswith(prefix)), None)
+        if header:
+            if current_section:
+                sections[current_section] = '\n'.join(section_content).strip()
+            current_section = header
+            section_content = []
+        elif current_section:
+            section_content.append(line)
+
+    # Add the last section
+    if current_section and section_content:
+        sections[current_section] = '\n'.join(section_content).strip()
+    return sections
+
+
+def _match_category(category):
+    """Match a category name from the model to one of ours (fuzzy matching)"""
+    category = category.lower()
+    if "field" in category and ("performance" in category or "skill" in category):
+        return "On-Field Performance"
+    if "leadership" in category or "lead" in category:
+        return "Leadership"
+    if "team" in category or "relationship" in category or "teammate" in category:
+        return "Team Relationship"
+    if "public" in category or "image" in category or "media" in category:
+        return "Public Image"
+    if "conduct" in category or "off-field" in category or "character" in category:
+        return "Off-Field Conduct"
+    return None
+
+
+def parse_category_scores(text):
+    """Extract "Category: Score - Explanation" lines, defaulting missing categories"""
+    category_scores = {category: {"score": 0, "explanation": ""} for category in CATEGORIES}
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line or ":" not in line:
+            continue
+        category_match = re.match(r'([^:]+):\s*(\d+)\s*-\s*(.+)', line)
+        if not category_match:
+            continue
+        category = _match_category(category_match.group(1).strip())
+        if category:
+            category_scores[category]["score"] = int(category_match.group(2))
+            category_scores[category]["explanation"] = category_match.group(3).strip()
+
+    # Set default scores for any missing categories
+    for category in category_scores:
+        if category_scores[category]["score"] == 0:
+            category_scores[category]["score"] = 65
+            category_scores[category]["explanation"] = f"Default score for {category}."
+    return category_scores
+
+
+def count_missing_details(details):
+    """Number of detail sections the model left empty"""
+    return sum(1 for detail in details.values() if detail == MISSING_DETAILS)
+
+
+def parse_report(analysis_text, search_results):
+    """Parse the model response into the report dict rendered by the app"""
+    sections = split_sections(analysis_text)
+    category_scores = parse_category_scores(sections.get('CATEGORY_SCORES', ''))
+
+    details = {
+        "performance": sections.get('PERFORMANCE_DETAILS', MISSING_DETAILS),
+        "leadership": sections.get('LEADERSHIP_DETAILS', MISSING_DETAILS),
+        "team_relationship": sections.get('TEAM_RELATIONSHIP_DETAILS', MISSING_DETAILS),
+        "public_image": sections.get('PUBLIC_IMAGE_DETAILS', MISSING_DETAILS),
+        "conduct": sections.get('CONDUCT_DETAILS', MISSING_DETAILS),
+    }
+
+    # Overall score is the average of the category scores
+    overall_score = round(sum(category_scores[category]["score"] for category in category_scores) / len(category_scores))
+
+    return {
+        'overall_score': overall_score,
+        'score_explanation': f"Average of all five character categories: {', '.join(category_scores.keys())}.",
+        'category_scores': category_scores,
+        'executive_summary': sections.get('EXECUTIVE_SUMMARY', ''),
+        'details': details,
+        'raw_data': search_results,
+    }
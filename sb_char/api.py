@@ -0,0 +1,269 @@
+"""JSON HTTP API for character reports.
+
+Run one or more workers with:
+
+    uvicorn sb_char.api:app --host 0.0.0.0 --port 8000 --workers 4
+
+Every request needs `Authorization: Bearer <token>`, where the token is signed
+with SB_CHAR_API_SECRET; issue one per client with
+
+    SB_CHAR_API_SECRET=... python -m sb_char.auth --issue-token CLIENT_NAME
+
+Each client may request SB_CHAR_API_RATE_LIMIT reports per minute (a batch
+counts once per name, and a batch larger than the limit is rejected with 413).
+Workers share reports, job state and these rate-limit counters through the
+cache backend selected by SB_CHAR_CACHE_URL (with more than one worker use a
+shared one, e.g. sqlite:///.sb_char_cache.db or redis://localhost:6379/0).
+Set SB_CHAR_STUB_UPSTREAMS=1 to serve stubbed SearchAPI and OpenAI responses
+for local load tests. Search query counts and yields are logged at INFO; set
+SB_CHAR_LOG_LEVEL=WARNING to silence them.
+
+Endpoints:
+    GET  /reports/{player_name}   one report, with ETag / If-None-Match support
+    POST /reports/batch           many reports in one request
+    POST /jobs                    start a long batch in the background
+    GET  /jobs/{job_id}           job status and results
+"""
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+
+from .auth import verify_token
+from .cache import RateLimiter, get_backend
+from .pipeline import ReportConfig, ReportError, configure_logging, create_clients, generate_report
+
+MAX_BATCH_SIZE = 100
+RATE_WINDOW = 60  # seconds
+JOB_TTL = 24 * 60 * 60  # seconds a job stays readable
+JOB_HEARTBEAT_INTERVAL = 10  # seconds between heartbeats of a running job
+JOB_STALE_AFTER = 60  # seconds without a heartbeat before a job counts as failed
+
+
+class BatchRequest(BaseModel):
+    player_names: list[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+def report_etag(report):
+    """Strong ETag for a report, derived from its canonical JSON"""
+    digest = hashlib.sha256(json.dumps(report, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches `etag`"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _unique(names):
+    """Strip names and drop duplicates, keeping the first occurrence"""
+    seen = {}
+    for name in names:
+        name = name.strip()
+        if name and name.lower() not in seen:
+            seen[name.lower()] = name
+    return list(seen.values())
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    configure_logging()
+    api_secret = os.environ.get("SB_CHAR_API_SECRET")
+    if not api_secret:
+        raise RuntimeError("SB_CHAR_API_SECRET must be set to verify client tokens")
+
+    config = ReportConfig.from_env(
+        cache=get_backend(),
+        max_concurrency=int(os.environ.get("SB_CHAR_MAX_CONCURRENCY", "32")),
+    )
+    if os.environ.get("SB_CHAR_STUB_UPSTREAMS") == "1":
+        from .stubs import StubLLMClient, StubSearchClient
+        search_client, llm_client = StubSearchClient(), StubLLMClient()
+    elif not config.api_keys_available:
+        raise RuntimeError("OPENAI_API_KEY and SEARCHAPI_API_KEY must be set (or SB_CHAR_STUB_UPSTREAMS=1)")
+    else:
+        search_client, llm_client = create_clients(config)
+
+    app.state.api_secret = api_secret.encode("utf-8")
+    app.state.config = config
+    app.state.rate_limiter = RateLimiter(
+        config.cache, limit=int(os.environ.get("SB_CHAR_API_RATE_LIMIT", "120")), window=RATE_WINDOW
+    )
+    app.state.search_client = search_client
+    app.state.llm_client = llm_client
+    app.state.limiter = asyncio.Semaphore(config.max_concurrency)
+    app.state.jobs = set()  # keep references to running job tasks
+    try:
+        yield
+    finally:
+        for task in app.state.jobs:
+            task.cancel()
+        await search_client.aclose()
+        await llm_client.aclose()
+
+
+app = FastAPI(title="Player Character Measurement API", lifespan=lifespan)
+
+
+async def require_client(request: Request):
+    """Client name from a valid bearer token, otherwise 401"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    client = verify_token(token.strip(), request.app.state.api_secret) if scheme.lower() == "bearer" else None
+    if client is None:
+        raise HTTPException(status_code=401, detail="Missing or invalid token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return client
+
+
+async def _charge(state, client, reports):
+    """Count `reports` against the client's rate limit, otherwise 413 or 429"""
+    limit = state.rate_limiter.limit
+    if reports > limit:
+        raise HTTPException(status_code=413,
+                            detail=f"Request needs {reports} reports but the rate limit is {limit} per "
+                                   f"{RATE_WINDOW} seconds; split it into smaller batches")
+    if not await asyncio.to_thread(state.rate_limiter.allow, client, reports):
+        raise HTTPException(status_code=429, detail="Rate limit exceeded",
+                            headers={"Retry-After": str(RATE_WINDOW)})
+
+
+async def _report(state, player_name):
+    return await generate_report(
+        player_name,
+        config=state.config,
+        search_client=state.search_client,
+        llm_client=state.llm_client,
+        limiter=state.limiter,
+    )
+
+
+async def _batch_entry(state, player_name):
+    """Report or error entry for one player in a batch or job"""
+    try:
+        report = await _report(state, player_name)
+    except ReportError as e:
+        return {"player_name": player_name, "error": str(e)}
+    return {"player_name": player_name, "etag": report_etag(report), "report": report}
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/reports/{player_name}")
+async def get_report(player_name: str, request: Request, response: Response,
+                     client: str = Depends(require_client)):
+    await _charge(request.app.state, client, 1)
+    try:
+        report = await _report(request.app.state, player_name)
+    except ReportError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    etag = report_etag(report)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return {"player_name": player_name, "report": report}
+
+
+@app.post("/reports/batch")
+async def batch_reports(batch: BatchRequest, request: Request, client: str = Depends(require_client)):
+    player_names = _unique(batch.player_names)
+    await _charge(request.app.state, client, len(player_names))
+    entries = await asyncio.gather(*(_batch_entry(request.app.state, name) for name in player_names))
+    return {"reports": entries}
+
+
+# A job is a small status record under job:{id}, a completed counter under
+# job:{id}:completed, a heartbeat timestamp under job:{id}:heartbeat and one key
+# per finished entry under job:{id}:result:{i}, so progress updates never
+# rewrite the finished reports.
+def _job_key(job_id, *parts):
+    return ":".join(["job", job_id, *map(str, parts)])
+
+
+async def _heartbeat(cache, job_id):
+    while True:
+        await asyncio.to_thread(cache.set, _job_key(job_id, "heartbeat"), time.time(), ttl=JOB_TTL)
+        await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+
+
+async def _run_job(state, job, player_names):
+    cache = state.config.cache
+    job_id = job["job_id"]
+
+    async def run_one(index, name):
+        entry = await _batch_entry(state, name)
+        await asyncio.to_thread(cache.set, _job_key(job_id, "result", index), entry, ttl=JOB_TTL)
+        await asyncio.to_thread(cache.incr, _job_key(job_id, "completed"), ttl=JOB_TTL)
+
+    job["status"] = "running"
+    await asyncio.to_thread(cache.set, _job_key(job_id), job, ttl=JOB_TTL)
+    heartbeat = asyncio.create_task(_heartbeat(cache, job_id))
+    try:
+        await asyncio.gather(*(run_one(i, name) for i, name in enumerate(player_names)))
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+    else:
+        job["status"] = "done"
+    finally:
+        heartbeat.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await heartbeat
+    job["finished_at"] = time.time()
+    await asyncio.to_thread(cache.set, _job_key(job_id), job, ttl=JOB_TTL)
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(batch: BatchRequest, request: Request, client: str = Depends(require_client)):
+    state = request.app.state
+    player_names = _unique(batch.player_names)
+    await _charge(state, client, len(player_names))
+
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "client": client,
+        "status": "pending",
+        "total": len(player_names),
+        "created_at": time.time(),
+    }
+    await asyncio.to_thread(state.config.cache.set, _job_key(job["job_id"]), job, ttl=JOB_TTL)
+    await asyncio.to_thread(state.config.cache.set, _job_key(job["job_id"], "heartbeat"), job["created_at"], ttl=JOB_TTL)
+
+    task = asyncio.create_task(_run_job(state, dict(job), player_names))
+    state.jobs.add(task)
+    task.add_done_callback(state.jobs.discard)
+    return {"job_id": job["job_id"], "status": "pending", "total": len(player_names),
+            "url": f"/jobs/{job['job_id']}"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str, request: Request, client: str = Depends(require_client)):
+    cache = request.app.state.config.cache
+    job = await asyncio.to_thread(cache.get, _job_key(job_id))
+    if job is None or job["client"] != client:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+
+    # A job whose worker died stops heartbeating; report it instead of "running" forever
+    heartbeat_at = await asyncio.to_thread(cache.get, _job_key(job_id, "heartbeat")) or 0
+    if job["status"] in ("pending", "running") and time.time() - heartbeat_at > JOB_STALE_AFTER:
+        job["status"] = "failed"
+        job["error"] = "The job stopped reporting progress; its worker probably restarted."
+
+    entries = await asyncio.gather(
+        *(asyncio.to_thread(cache.get, _job_key(job_id, "result", i)) for i in range(job["total"]))
+    )
+    job["completed"] = await asyncio.to_thread(cache.get, _job_key(job_id, "completed")) or 0
+    job["results"] = [entry for entry in entries if entry is not None]
+    return job
@@ -0,0 +1,144 @@
+"""Password hashing and signed session tokens.
+
+Passwords are stored as scrypt hashes; generate one for the secrets file with
+
+    python -m sb_char.auth
+
+API clients authenticate with the same kind of signed token; issue one with
+
+    SB_CHAR_API_SECRET=... python -m sb_char.auth --issue-token CLIENT_NAME [--days N]
+
+Session tokens are `<payload>.<signature>` strings: a base64url JSON payload
+holding the username and expiry, signed with HMAC-SHA256. Signatures and
+password hashes are always compared in constant time.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+DEFAULT_SESSION_TTL = 12 * 60 * 60  # seconds
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def hash_password(password, *, salt=None):
+    """Hash `password` as "scrypt$n$r$p$salt$hash" """
+    salt = salt or secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+def verify_password(password, encoded):
+    """Check `password` against a hash from hash_password"""
+    try:
+        scheme, n, r, p, salt, expected = encoded.split("$")
+        if scheme != "scrypt":
+            return False
+        digest = hashlib.scrypt(
+            password.encode("utf-8"), salt=_b64decode(salt), n=int(n), r=int(r), p=int(p)
+        )
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(digest, _b64decode(expected))
+
+
+def _sign(payload, secret):
+    return _b64encode(hmac.new(secret, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(username, secret, ttl=DEFAULT_SESSION_TTL):
+    """Signed session token for `username`, valid for `ttl` seconds"""
+    payload = _b64encode(json.dumps({"u": username, "exp": int(time.time() + ttl)}).encode("utf-8"))
+    return f"{payload}.{_sign(payload, secret)}"
+
+
+def verify_token(token, secret):
+    """Return the username in a valid, unexpired token, otherwise None"""
+    if not token or token.count(".") != 1:
+        return None
+    payload, signature = token.split(".")
+    try:
+        # Compare bytes: compare_digest rejects non-ASCII str, which a forged cookie may contain
+        if not hmac.compare_digest(signature.encode("utf-8"), _sign(payload, secret).encode("ascii")):
+            return None
+        claims = json.loads(_b64decode(payload))
+    except (ValueError, UnicodeError):
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims.get("u")
+
+
+@dataclass(frozen=True)
+class AuthConfig:
+    """Credentials and session-signing secret, loaded once per process"""
+
+    username: str
+    password_hash: str
+    session_secret: bytes
+    session_ttl: int = DEFAULT_SESSION_TTL
+
+    @classmethod
+    def from_credentials(cls, credentials, session_secret=None, session_ttl=DEFAULT_SESSION_TTL):
+        """Build from a {"username", "password_hash"} mapping.
+
+        A plaintext "password" entry is still accepted and hashed here, once.
+        Without `session_secret` (or SB_CHAR_SESSION_SECRET) a random one is
+        generated, so tokens only survive within this process.
+        """
+        password_hash = credentials.get("password_hash") or hash_password(credentials["password"])
+        session_secret = session_secret or os.environ.get("SB_CHAR_SESSION_SECRET")
+        if not session_secret:
+            logger.warning("No session secret configured; sessions will not survive a restart or span workers")
+            session_secret = secrets.token_bytes(32)
+        if isinstance(session_secret, str):
+            session_secret = session_secret.encode("utf-8")
+        return cls(credentials["username"], password_hash, session_secret, session_ttl)
+
+    def check_password(self, username, password):
+        """Whether the username and password match the configured credentials"""
+        # Always hash so the response time doesn't reveal whether the username matched
+        password_ok = verify_password(password, self.password_hash)
+        username_ok = hmac.compare_digest(username.encode("utf-8"), self.username.encode("utf-8"))
+        return username_ok and password_ok
+
+    def issue_token(self, username):
+        return issue_token(username, self.session_secret, self.session_ttl)
+
+    def verify_token(self, token):
+        return verify_token(token, self.session_secret)
+
+
+if __name__ == "__main__":
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(description="Hash a password or issue an API client token")
+    parser.add_argument("--issue-token", metavar="CLIENT", help="issue a token signed with SB_CHAR_API_SECRET")
+    parser.add_argument("--days", type=int, default=90, help="token lifetime (default 90)")
+    args = parser.parse_args()
+
+    if args.issue_token:
+        api_secret = os.environ.get("SB_CHAR_API_SECRET")
+        if not api_secret:
+            parser.error("SB_CHAR_API_SECRET must be set")
+        print(issue_token(args.issue_token, api_secret.encode("utf-8"), ttl=args.days * 24 * 60 * 60))
+    else:
+        print(hash_password(getpass.getpass("Password to hash: ")))
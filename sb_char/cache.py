@@ -0,0 +1,310 @@
+"""Pluggable cache backends shared by every app worker process.
+
+The backend is selected with the SB_CHAR_CACHE_URL environment variable:
+
+    memory://                     in-process LRU (default, single worker only);
+                                  memory://?max_mb=64 caps its size
+    sqlite:///path/to/cache.db    file-backed, shared by workers on one host
+    redis://localhost:6379/0      any Redis-protocol server (needs `redis`)
+
+Values are stored as JSON so every backend can hold the same search results
+and reports. `incr` is atomic across processes, which is what the shared
+rate-limit counters rely on.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_CACHE_URL = "memory://"
+PURGE_INTERVAL = 5 * 60  # seconds between sweeps of expired entries
+DEFAULT_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+# Small entries whose loss changes behaviour (a reset rate limit, a signed-out
+# session accepted again) rather than just costing a recomputation
+CONTROL_PREFIXES = ("rate:", "revoked-session:")
+
+
+def cache_key(*parts):
+    """Build a stable cache key from the given parts"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """Interface implemented by every cache backend"""
+
+    def get(self, key):
+        """Return the cached value for `key`, or None if missing or expired"""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        """Store `value` under `key`, expiring after `ttl` seconds if given"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove `key` if present"""
+        raise NotImplementedError
+
+    def incr(self, key, ttl=None, amount=1):
+        """Atomically add `amount` to the counter at `key` and return the new value.
+
+        `ttl` is applied when the counter is created, so a fixed window resets
+        once it expires.
+        """
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local LRU bounded by `max_bytes`; fine for a single worker or local development.
+
+    Counters and keys starting with one of CONTROL_PREFIXES (rate-limit
+    windows, session revocations) are kept outside the LRU and only expire by
+    TTL, so bulky report traffic can never evict them.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (JSON string, expires_at, size)
+        self._control = {}  # key -> (JSON string, expires_at), never evicted
+        self._bytes = 0
+        self._last_purge = 0.0
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        if key in self._control:
+            entry = self._control[key]
+            if entry[1] is not None and entry[1] <= now:
+                del self._control[key]
+                return None
+            return entry
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= now:
+            self._remove(key)
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _remove(self, key):
+        self._control.pop(key, None)
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _maybe_purge(self, now):
+        # Expired entries are otherwise only dropped when their key is read again
+        if now - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        for store in (self._data, self._control):
+            for expired in [k for k, entry in store.items() if entry[1] is not None and entry[1] <= now]:
+                self._remove(expired)
+
+    def _store(self, key, raw, expires_at, now, control=False):
+        self._remove(key)
+        self._maybe_purge(now)
+        if control or key.startswith(CONTROL_PREFIXES):
+            self._control[key] = (raw, expires_at)
+            return
+        size = sys.getsizeof(key) + sys.getsizeof(raw)
+        if size > self.max_bytes:
+            return
+        self._data[key] = (raw, expires_at, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._data)))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.time())
+            return None if entry is None else json.loads(entry[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        raw = json.dumps(value)
+        with self._lock:
+            self._store(key, raw, now + ttl if ttl else None, now)
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def incr(self, key, ttl=None, amount=1):
+        now = time.time()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is None:
+                count, expires_at = amount, (now + ttl if ttl else None)
+            else:
+                count, expires_at = json.loads(entry[0]) + amount, entry[1]
+            self._store(key, json.dumps(count), expires_at, now, control=True)
+            return count
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "control_entries": len(self._control),
+            }
+
+
+class SQLiteBackend(CacheBackend):
+    """File-backed backend shared by all worker processes on one host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections must not be shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def purge_expired(self):
+        """Delete every expired entry, e.g. old rate-limit windows"""
+        self._connect().execute(
+            "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+
+    def _maybe_purge(self, now):
+        # Keys such as rate:{user}:{bucket} are never read again once expired,
+        # so sweep periodically instead of relying on reads
+        if now - self._last_purge >= PURGE_INTERVAL:
+            self._last_purge = now
+            self.purge_expired()
+
+    def get(self, key):
+        row = self._connect().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        self._maybe_purge(now)
+        expires_at = now + ttl if ttl else None
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), expires_at),
+        )
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def incr(self, key, ttl=None, amount=1):
+        now = time.time()
+        self._maybe_purge(now)
+        conn = self._connect()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent workers serialize
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM cache WHERE key = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                (key, now),
+            )
+            conn.execute(
+                "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + excluded.value",
+                (key, str(amount), now + ttl if ttl else None),
+            )
+            count = int(conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()[0])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+
+class RedisBackend(CacheBackend):
+    """Backend for any Redis-protocol server, shared across hosts"""
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "The redis:// cache backend requires the `redis` package: pip install redis"
+            ) from e
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, json.dumps(value), ex=int(ttl) if ttl else None)
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def incr(self, key, ttl=None, amount=1):
+        count = self._client.incrby(key, amount)
+        if count == amount and ttl:
+            self._client.expire(key, int(ttl))
+        return count
+
+
+def get_backend(url=None, *, memory_max_bytes=DEFAULT_MEMORY_MAX_BYTES):
+    """Create the cache backend for `url` (defaults to SB_CHAR_CACHE_URL).
+
+    `memory_max_bytes` bounds a memory:// backend unless the URL sets max_mb.
+    """
+    url = url or os.environ.get("SB_CHAR_CACHE_URL", DEFAULT_CACHE_URL)
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        max_mb = parse_qs(parsed.query).get("max_mb")
+        return MemoryBackend(int(float(max_mb[0]) * 1024 * 1024) if max_mb else memory_max_bytes)
+    if parsed.scheme == "sqlite":
+        # sqlite:///relative.db and sqlite:////absolute/path.db, as in SQLAlchemy
+        path = parsed.path[1:] if parsed.path.startswith("/") else parsed.path
+        if not path or path == ":memory:":
+            # Each thread has its own connection, so an in-memory database would
+            # be a different, empty one on every thread
+            raise ValueError(f"sqlite:// cache URL needs a file path, e.g. sqlite:///.sb_char_cache.db, got {url!r}")
+        return SQLiteBackend(path)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported cache backend URL: {url}")
+
+
+class RateLimiter:
+    """Fixed-window rate limiter whose counters live in a shared backend"""
+
+    def __init__(self, backend, limit, window):
+        self.backend = backend
+        self.limit = limit
+        self.window = window
+
+    def allow(self, identity, cost=1):
+        """Count `cost` units for `identity` and return whether they fit within the limit.
+
+        A rejected request is refunded, so it does not use up the quota left
+        for smaller requests in the same window.
+        """
+        key = f"rate:{identity}:{int(time.time() // self.window)}"
+        count = self.backend.incr(key, ttl=self.window, amount=cost)
+        if count > self.limit:
+            self.backend.incr(key, ttl=self.window, amount=-cost)
+            return False
+        return True
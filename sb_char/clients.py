@@ -0,0 +1,66 @@
+"""Async search and LLM clients used by the report pipeline.
+
+Any object with the same coroutine methods can be passed to the pipeline in
+their place, e.g. stubs for tests and load tests. The SDKs are imported when
+a client is created, not when this module is imported.
+"""
+SEARCH_URL = "https://www.searchapi.io/api/v1/search"
+
+
+class SearchAPIClient:
+    """SearchAPI (Google engine) client returning normalized result dicts"""
+
+    def __init__(self, api_key, timeout=30.0):
+        import httpx
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {api_key}"}, timeout=timeout
+        )
+
+    async def query(self, player_name, kind, page=1, num_results=10):
+        """Fetch one page of "general" or "news" results for the player"""
+        if kind == "news":
+            params = {"engine": "google", "q": f"{player_name} nfl news recent", "tbm": "nws"}
+        else:
+            params = {"engine": "google", "q": f"{player_name} nfl player stats career info"}
+        params.update(num=num_results, page=page)
+
+        response = await self._client.get(SEARCH_URL, params=params)
+        if response.status_code != 200:
+            return []
+        return [
+            {
+                'title': result.get("title", "No title"),
+                'link': result.get("link", ""),
+                'snippet': result.get("snippet", "No snippet"),
+                'source': kind,
+            }
+            for result in response.json().get("organic_results", [])
+        ]
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+class OpenAIClient:
+    """Chat completion client backed by the OpenAI async SDK"""
+
+    def __init__(self, api_key, model="gpt-3.5-turbo", temperature=0.5):
+        import openai
+        self._client = openai.AsyncOpenAI(api_key=api_key)
+        self.model = model
+        self.temperature = temperature
+
+    async def complete(self, system_prompt, prompt):
+        """Return the model's reply to `prompt`"""
+        response = await self._client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=self.temperature,
+        )
+        return response.choices[0].message.content
+
+    async def aclose(self):
+        await self._client.close()
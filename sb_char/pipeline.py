@@ -0,0 +1,238 @@
+"""UI-independent async report pipeline.
+
+Usable from Streamlit, a web service, a notebook or a batch job:
+
+    config = ReportConfig.from_env()
+    report = await generate_report("Patrick Mahomes", config=config)
+    reports = await generate_reports(["Patrick Mahomes", "Josh Allen"], config=config)
+
+Progress is reported through an optional `on_progress` callback receiving
+ProgressEvent objects; failures raise ReportError. Call configure_logging() to
+see the per-player search query counts and yields (SB_CHAR_LOG_LEVEL).
+"""
+import asyncio
+import contextlib
+import logging
+import os
+from dataclasses import dataclass
+
+from .analysis import SYSTEM_PROMPT, build_prompt, count_missing_details, parse_report
+from .cache import cache_key
+from .clients import OpenAIClient, SearchAPIClient
+from .search import adaptive_search
+
+logger = logging.getLogger(__name__)
+
+
+class ReportError(Exception):
+    """Raised when a report cannot be generated after all retries"""
+
+
+@dataclass(frozen=True)
+class ReportConfig:
+    """Settings for the report pipeline"""
+
+    openai_api_key: str | None = None
+    searchapi_key: str | None = None
+    model: str = "gpt-3.5-turbo"
+    temperature: float = 0.5
+    search_page_size: int = 10  # results per query page
+    search_target_results: int = 12  # distinct relevant results that end the search (reachable in round one)
+    search_min_results: int = 6  # below the target, enough if every category has evidence
+    search_max_pages: int = 3  # pages per query (general/news) at most
+    search_min_category_hits: int = 2  # results per category before its evidence counts as enough
+    max_retries: int = 2
+    retry_delay: float = 1.0  # seconds between attempts
+    max_concurrency: int = 8  # reports in flight at once per limiter
+    # Optional sb_char.cache backend shared with other workers. Its methods block
+    # (SQLite locks, Redis round trips), so the pipeline calls them via asyncio.to_thread.
+    cache: object = None
+    search_cache_ttl: int = 6 * 60 * 60  # seconds
+    report_cache_ttl: int = 6 * 60 * 60  # seconds
+
+    @classmethod
+    def from_env(cls, **overrides):
+        """Build a config from OPENAI_API_KEY / SEARCHAPI_API_KEY"""
+        overrides.setdefault("openai_api_key", os.environ.get("OPENAI_API_KEY"))
+        overrides.setdefault("searchapi_key", os.environ.get("SEARCHAPI_API_KEY"))
+        return cls(**overrides)
+
+    @property
+    def api_keys_available(self):
+        return self.openai_api_key is not None and self.searchapi_key is not None
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Progress notification emitted while a report is generated"""
+
+    player_name: str
+    stage: str  # "cached", "search", "analyze", "retry", "done" or "failed"
+    attempt: int
+    message: str
+
+
+def configure_logging(level=None):
+    """Send sb_char log lines (search query counts and yields, retries) to stderr.
+
+    The level comes from `level` or SB_CHAR_LOG_LEVEL and defaults to INFO;
+    a handler is only added if none is configured yet.
+    """
+    package_logger = logging.getLogger("sb_char")
+    package_logger.setLevel(level or os.environ.get("SB_CHAR_LOG_LEVEL", "INFO").upper())
+    if not package_logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        package_logger.addHandler(handler)
+
+
+def create_clients(config):
+    """Default search and LLM clients for `config`"""
+    return (
+        SearchAPIClient(config.searchapi_key),
+        OpenAIClient(config.openai_api_key, model=config.model, temperature=config.temperature),
+    )
+
+
+def _normalize(player_name):
+    return player_name.strip().lower()
+
+
+async def search_player_info(player_name, *, config, client):
+    """Search for information about an NFL player, using the shared cache if configured"""
+    key = cache_key(
+        "search", _normalize(player_name), config.search_page_size, config.search_target_results,
+        config.search_min_results, config.search_max_pages, config.search_min_category_hits,
+    )
+    if config.cache is not None:
+        cached_results = await asyncio.to_thread(config.cache.get, key)
+        if cached_results is not None:
+            return cached_results
+
+    try:
+        search_results = await adaptive_search(player_name, config=config, client=client)
+    except Exception as e:
+        logger.warning("Search failed for %s: %s", player_name, e)
+        return []
+
+    if search_results and config.cache is not None:
+        await asyncio.to_thread(config.cache.set, key, search_results, ttl=config.search_cache_ttl)
+    return search_results
+
+
+async def analyze_player(player_name, search_results, *, config, client):
+    """Analyze player perception with the LLM, retrying failed or incomplete responses"""
+    prompt = build_prompt(player_name, search_results)
+
+    for attempt in range(config.max_retries + 1):
+        try:
+            analysis_text = await client.complete(SYSTEM_PROMPT, prompt)
+        except Exception as e:
+            if attempt == config.max_retries:
+                raise ReportError(f"Analysis failed after {config.max_retries + 1} attempts: {e}") from e
+            await asyncio.sleep(config.retry_delay)
+            continue
+
+        report = parse_report(analysis_text, search_results)
+
+        # Retry if too many detail sections are missing
+        if count_missing_details(report['details']) >= 3 and attempt < config.max_retries:
+            await asyncio.sleep(config.retry_delay)
+            continue
+        return report
+
+    raise ReportError(f"Analysis failed after {config.max_retries + 1} attempts.")
+
+
+async def generate_report(player_name, *, config, search_client=None, llm_client=None,
+                          on_progress=None, limiter=None):
+    """Generate a character report for `player_name`.
+
+    Clients default to the SearchAPI and OpenAI clients built from `config`.
+    `limiter` is an optional asyncio.Semaphore bounding concurrent reports.
+    Raises ReportError if no usable report is produced after all retries.
+    """
+    def emit(stage, attempt, message):
+        if on_progress is not None:
+            on_progress(ProgressEvent(player_name, stage, attempt, message))
+
+    # Serve a report any worker generated recently
+    report_key = cache_key("report", _normalize(player_name))
+    if config.cache is not None:
+        cached_report = await asyncio.to_thread(config.cache.get, report_key)
+        if cached_report is not None:
+            emit("cached", 0, f"Loaded cached report for {player_name}")
+            return cached_report
+
+    owned_clients = []
+    if search_client is None or llm_client is None:
+        default_search, default_llm = create_clients(config)
+        owned_clients = [default_search, default_llm]
+        search_client = search_client or default_search
+        llm_client = llm_client or default_llm
+
+    error = "Unable to generate a complete report after multiple attempts. Please try again."
+    try:
+        async with limiter or contextlib.nullcontext():
+            for attempt in range(config.max_retries + 1):
+                if attempt:
+                    emit("retry", attempt, f"Retry attempt: {attempt}")
+                    await asyncio.sleep(config.retry_delay)
+
+                emit("search", attempt, f"Searching for information about {player_name}...")
+                search_results = await search_player_info(player_name, config=config, client=search_client)
+                if not search_results:
+                    error = (f"Unable to find sufficient information for {player_name}. "
+                             "Please check the spelling or try another player.")
+                    continue
+
+                emit("analyze", attempt, f"Analyzing {len(search_results)} sources...")
+                try:
+                    report = await analyze_player(player_name, search_results, config=config, client=llm_client)
+                except ReportError as e:
+                    error = f"Error generating report: {e}"
+                    continue
+
+                # Retry incomplete reports while attempts remain
+                if count_missing_details(report['details']) >= 3:
+                    if attempt < config.max_retries:
+                        continue
+                elif config.cache is not None:
+                    # Only complete reports are shared with other sessions
+                    await asyncio.to_thread(config.cache.set, report_key, report, ttl=config.report_cache_ttl)
+
+                emit("done", attempt, f"Report ready for {player_name}")
+                return report
+    finally:
+        for client in owned_clients:
+            await client.aclose()
+
+    emit("failed", config.max_retries, error)
+    raise ReportError(error)
+
+
+async def generate_reports(player_names, *, config, search_client=None, llm_client=None, on_progress=None):
+    """Generate reports for many players concurrently, at most `config.max_concurrency` at a time.
+
+    Returns one entry per name, in order: the report dict or the ReportError raised for it.
+    """
+    owned_clients = []
+    if search_client is None or llm_client is None:
+        default_search, default_llm = create_clients(config)
+        owned_clients = [default_search, default_llm]
+        search_client = search_client or default_search
+        llm_client = llm_client or default_llm
+
+    limiter = asyncio.Semaphore(config.max_concurrency)
+    try:
+        return await asyncio.gather(
+            *(
+                generate_report(name, config=config, search_client=search_client, llm_client=llm_client,
+                                on_progress=on_progress, limiter=limiter)
+                for name in player_names
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        for client in owned_clients:
+            await client.aclose()
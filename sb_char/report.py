@@ -0,0 +1,183 @@
+"""Compact in-memory report representation and a memory-bounded report store.
+
+Report dicts from the pipeline carry one Python dict per search result plus
+long detail strings. For retention across reruns and sessions they are
+converted to slotted dataclasses with the sources held as column tuples.
+Identical source columns are interned, so sessions viewing the same report
+share one copy. ReportStore keeps reports in an LRU within a byte budget;
+sessions hold only the store key.
+"""
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .cache import cache_key
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _sizeof(values):
+    """Approximate bytes held by a tuple and the strings/ints in it"""
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class SourceColumns:
+    """Search results stored column-wise"""
+
+    titles: tuple
+    links: tuple
+    snippets: tuple
+    kinds: tuple
+
+    @classmethod
+    def from_results(cls, results):
+        return cls(
+            titles=tuple(result.get('title', 'No title') for result in results),
+            links=tuple(result.get('link', '') for result in results),
+            snippets=tuple(result.get('snippet', '') for result in results),
+            # Only a handful of distinct kinds, so share one string object each
+            kinds=tuple(sys.intern(result.get('source', 'unknown')) for result in results),
+        )
+
+    def __len__(self):
+        return len(self.titles)
+
+    def nbytes(self):
+        return sys.getsizeof(self) + sum(
+            _sizeof(column) for column in (self.titles, self.links, self.snippets)
+        ) + sys.getsizeof(self.kinds)
+
+    def to_results(self):
+        """Expand back to the pipeline's list of result dicts"""
+        return [
+            {'title': title, 'link': link, 'snippet': snippet, 'source': kind}
+            for title, link, snippet, kind in zip(self.titles, self.links, self.snippets, self.kinds)
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class Report:
+    """Compact, immutable form of a pipeline report dict"""
+
+    player_name: str
+    overall_score: int
+    score_explanation: str
+    category_scores: tuple  # ((category, score, explanation), ...)
+    executive_summary: str
+    details: tuple  # ((detail key, text), ...)
+    sources: SourceColumns
+
+    def category(self, name):
+        """(score, explanation) for a category"""
+        for category, score, explanation in self.category_scores:
+            if category == name:
+                return score, explanation
+        raise KeyError(name)
+
+    def detail(self, key):
+        return dict(self.details)[key]
+
+    def nbytes(self):
+        """Approximate bytes held by this report, excluding its shared sources"""
+        size = sys.getsizeof(self) + sys.getsizeof(self.score_explanation) + sys.getsizeof(self.executive_summary)
+        size += sum(_sizeof(entry) for entry in self.category_scores) + sys.getsizeof(self.category_scores)
+        size += sum(_sizeof(entry) for entry in self.details) + sys.getsizeof(self.details)
+        return size
+
+    def to_dict(self):
+        """Expand back to the pipeline's report dict"""
+        return {
+            'overall_score': self.overall_score,
+            'score_explanation': self.score_explanation,
+            'category_scores': {
+                category: {"score": score, "explanation": explanation}
+                for category, score, explanation in self.category_scores
+            },
+            'executive_summary': self.executive_summary,
+            'details': dict(self.details),
+            'raw_data': self.sources.to_results(),
+        }
+
+
+class ReportStore:
+    """Process-wide LRU of compact reports, bounded by an approximate byte budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._reports = OrderedDict()
+        self._sources = weakref.WeakValueDictionary()  # content key -> interned SourceColumns
+        self._source_refs = {}  # id(SourceColumns) -> [columns, reports in the store using them]
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _intern_sources(self, results):
+        key = cache_key("sources", results)
+        columns = self._sources.get(key)
+        if columns is None:
+            columns = SourceColumns.from_results(results)
+            self._sources[key] = columns
+        return columns
+
+    def put(self, player_name, report_dict):
+        """Store a pipeline report dict and return its key"""
+        key = cache_key("report", player_name, report_dict)
+        with self._lock:
+            if key in self._reports:
+                self._reports.move_to_end(key)
+                return key
+            report = Report(
+                player_name=player_name,
+                overall_score=report_dict['overall_score'],
+                score_explanation=report_dict['score_explanation'],
+                category_scores=tuple(
+                    (category, values["score"], values["explanation"])
+                    for category, values in report_dict['category_scores'].items()
+                ),
+                executive_summary=report_dict['executive_summary'],
+                details=tuple(report_dict['details'].items()),
+                sources=self._intern_sources(report_dict['raw_data']),
+            )
+            self._reports[key] = report
+            self._bytes += report.nbytes()
+            ref = self._source_refs.setdefault(id(report.sources), [report.sources, 0])
+            if ref[1] == 0:
+                self._bytes += report.sources.nbytes()
+            ref[1] += 1
+            self._evict()
+        return key
+
+    def get(self, key):
+        """Return the report for `key`, or None if it was evicted"""
+        with self._lock:
+            report = self._reports.get(key)
+            if report is not None:
+                self._reports.move_to_end(key)
+            return report
+
+    def _evict(self):
+        # Always keep the most recent report, even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._reports) > 1:
+            _, report = self._reports.popitem(last=False)
+            self._bytes -= report.nbytes()
+            ref = self._source_refs[id(report.sources)]
+            ref[1] -= 1
+            if ref[1] == 0:
+                self._bytes -= report.sources.nbytes()
+                del self._source_refs[id(report.sources)]
+
+    def nbytes(self, key):
+        """Approximate bytes attributable to one report, including its sources"""
+        report = self.get(key)
+        return 0 if report is None else report.nbytes() + report.sources.nbytes()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "reports": len(self._reports),
+                "sources": len(self._source_refs),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
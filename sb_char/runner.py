@@ -0,0 +1,42 @@
+"""Run pipeline coroutines from synchronous code such as a Streamlit script.
+
+One background event loop is shared by every caller in the process, so
+reports from many sessions run concurrently over the same pooled clients.
+"""
+import asyncio
+import threading
+
+from .pipeline import create_clients, generate_report
+
+
+class ReportRunner:
+    """Owns a background event loop, the pipeline clients and the concurrency limit"""
+
+    def __init__(self, config):
+        self.config = config
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="sb-char-reports", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+
+    async def _setup(self):
+        self._search_client, self._llm_client = create_clients(self.config)
+        self._limiter = asyncio.Semaphore(self.config.max_concurrency)
+
+    def submit(self, player_name, on_progress=None):
+        """Schedule a report and return a concurrent.futures.Future for it.
+
+        `on_progress` is called from the loop thread; hand events to the
+        caller's thread (e.g. through a queue) before touching UI state.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            generate_report(
+                player_name,
+                config=self.config,
+                search_client=self._search_client,
+                llm_client=self._llm_client,
+                on_progress=on_progress,
+                limiter=self._limiter,
+            ),
+            self._loop,
+        )
@@ -0,0 +1,111 @@
+"""Adaptive search strategy for player coverage.
+
+Instead of requesting a fixed 50 results per query, start with one small page
+of general and news results. A well-covered player reaches
+`config.search_target_results` distinct relevant articles in that first round
+and stops after two requests. Further pages are only fetched while the
+relevant count is below the target, and even then the search stops once it
+has `config.search_min_results` articles with evidence for every report
+category. A query that returns an empty page, or nothing new, has run out and
+is not paged again; a short page is not enough, since Google often returns
+fewer organic results than requested. Each search logs its query count and
+yields so the thresholds can be tuned.
+"""
+import asyncio
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+SEARCH_KINDS = ("general", "news")
+
+# Generational suffixes skipped when picking the surname to match on
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Words that count as evidence for each report category
+CATEGORY_KEYWORDS = {
+    "On-Field Performance": ("stats", "yards", "touchdown", "season", "game", "record", "passing", "rushing", "playoff"),
+    "Leadership": ("leader", "leadership", "captain", "mentor", "vocal"),
+    "Team Relationship": ("teammate", "locker room", "coach", "contract", "trade", "holdout", "chemistry"),
+    "Public Image": ("fans", "media", "endorsement", "interview", "commercial", "brand", "popular"),
+    "Off-Field Conduct": ("charity", "foundation", "community", "arrest", "suspension", "lawsuit", "off-field"),
+}
+
+
+def surname(player_name):
+    """Player's last name, ignoring suffixes such as "Jr." or "III" """
+    tokens = [token.strip(".,").lower() for token in player_name.split()]
+    names = [token for token in tokens if token and token not in NAME_SUFFIXES]
+    return names[-1] if names else (tokens[-1] if tokens else "")
+
+
+def is_relevant(result, player_name):
+    """Whether the result mentions the player's last name as a whole word"""
+    last_name = surname(player_name)
+    text = f"{result.get('title', '')} {result.get('snippet', '')}".lower()
+    # "Ward" must not match "forward", nor "Hill" match "Hilltop"
+    return re.search(rf"\b{re.escape(last_name)}\b", text) is not None
+
+
+def category_coverage(results):
+    """Number of results carrying evidence for each report category"""
+    coverage = dict.fromkeys(CATEGORY_KEYWORDS, 0)
+    for result in results:
+        text = f"{result.get('title', '')} {result.get('snippet', '')}".lower()
+        for category, keywords in CATEGORY_KEYWORDS.items():
+            if any(keyword in text for keyword in keywords):
+                coverage[category] += 1
+    return coverage
+
+
+async def adaptive_search(player_name, *, config, client):
+    """Collect distinct, relevant results page by page until coverage is sufficient"""
+    seen_links = set()
+    collected = []
+    relevant = []
+    pages = dict.fromkeys(SEARCH_KINDS, 0)
+    exhausted = set()
+    queries = 0
+    thin = []
+
+    while True:
+        kinds = [kind for kind in SEARCH_KINDS if kind not in exhausted and pages[kind] < config.search_max_pages]
+        if not kinds:
+            break
+        for kind in kinds:
+            pages[kind] += 1
+        batches = await asyncio.gather(
+            *(client.query(player_name, kind, page=pages[kind], num_results=config.search_page_size) for kind in kinds)
+        )
+        queries += len(kinds)
+
+        for kind, batch in zip(kinds, batches):
+            new_results = 0
+            for result in batch:
+                key = result.get('link') or result.get('title')
+                if key in seen_links:
+                    continue
+                seen_links.add(key)
+                collected.append(result)
+                new_results += 1
+                if is_relevant(result, player_name):
+                    relevant.append(result)
+            # Short pages are common (ads and featured blocks take slots), so only
+            # an empty page or one with nothing new means this query has run out
+            if new_results == 0:
+                exhausted.add(kind)
+
+        if len(relevant) >= config.search_target_results:
+            break
+        # Low count: thin category evidence is the only reason to keep paging
+        coverage = category_coverage(relevant)
+        thin = [category for category, hits in coverage.items() if hits < config.search_min_category_hits]
+        if len(relevant) >= config.search_min_results and not thin:
+            break
+
+    logger.info(
+        "search %r: %d queries, %d results, %d relevant, pages=%s, thin categories=%s",
+        player_name, queries, len(collected), len(relevant), pages, thin,
+    )
+    # Fall back to everything collected if the name check filtered it all out
+    return relevant or collected
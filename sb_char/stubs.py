@@ -0,0 +1,61 @@
+"""Stand-in upstream clients for local load tests and development.
+
+They mimic the SearchAPI and OpenAI clients' interfaces and latency without
+any network access. Enable them in the API service with SB_CHAR_STUB_UPSTREAMS=1.
+"""
+import asyncio
+
+from .analysis import CATEGORIES
+from .search import CATEGORY_KEYWORDS
+
+
+class StubSearchClient:
+    """Pages through `available` synthetic general and news results per player"""
+
+    def __init__(self, latency=0.2, available=50):
+        self.latency = latency
+        self.available = available
+
+    async def query(self, player_name, kind, page=1, num_results=10):
+        await asyncio.sleep(self.latency)
+        start = (page - 1) * num_results
+        topics = [keywords[0] for keywords in CATEGORY_KEYWORDS.values()]
+        return [
+            {
+                'title': f"{player_name} {kind} article {i + 1}",
+                'link': f"https://example.com/{kind}/{player_name.replace(' ', '-').lower()}/{i + 1}",
+                'snippet': f"Coverage of {player_name}: {topics[i % len(topics)]}.",
+                'source': kind,
+            }
+            for i in range(start, min(start + num_results, self.available))
+        ]
+
+    async def aclose(self):
+        pass
+
+
+class StubLLMClient:
+    """Returns a well-formed report whose scores are derived from the player's name"""
+
+    def __init__(self, latency=1.0):
+        self.latency = latency
+
+    async def complete(self, system_prompt, prompt):
+        await asyncio.sleep(self.latency)
+        seed = sum(map(ord, prompt[:200]))
+        scores = "\n".join(
+            f"{category}: {40 + (seed + i * 17) % 60} - Stubbed explanation for {category}."
+            for i, category in enumerate(CATEGORIES)
+        )
+        return (
+            f"1. CATEGORY_SCORES\n{scores}\n"
+            "2. EXECUTIVE_SUMMARY\nStubbed executive summary.\n"
+            "3. PERFORMANCE_DETAILS\nStubbed performance details.\n"
+            "4. LEADERSHIP_DETAILS\nStubbed leadership details.\n"
+            "5. TEAM_RELATIONSHIP_DETAILS\nStubbed team relationship details.\n"
+            "6. PUBLIC_IMAGE_DETAILS\nStubbed public image details.\n"
+            "7. CONDUCT_DETAILS\nStubbed conduct details.\n"
+        )
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,94 @@
+"""Startup benchmark for the Streamlit app.
+
+Measures the import cost a fresh session pays before `show_signin` can render
+and fails if it exceeds the budget or if a heavy SDK is imported at module level.
+
+Usage: python -m scripts.bench_startup [--budget SECONDS] [--runs N]
+
+tests/test_startup.py runs it under pytest whenever Streamlit is installed.
+"""
+import argparse
+import ast
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+APP_PATH = Path(__file__).resolve().parent.parent / "app.py"
+
+# Modules that must only be imported lazily (after sign-in, when a report is requested)
+LAZY_MODULES = {"openai", "httpx", "requests", "pandas"}
+
+# Of those, modules Streamlit itself never pulls in, so they must be absent after startup
+STARTUP_FORBIDDEN = ["openai"]
+
+DEFAULT_BUDGET = 1.5  # seconds, median of the cold import runs
+DEFAULT_RUNS = 5
+
+
+def top_level_imports(path):
+    """Return the module names imported at module level in `path`"""
+    tree = ast.parse(path.read_text(), filename=str(path))
+    modules = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.add(node.module)
+    return modules
+
+
+def eager_lazy_imports(path):
+    """Modules from LAZY_MODULES that `path` imports at module level"""
+    return sorted({name.split(".")[0] for name in top_level_imports(path)} & LAZY_MODULES)
+
+
+def time_cold_import(modules):
+    """Import `modules` in a fresh interpreter and return (seconds, loaded lazy modules)"""
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {sorted(modules)!r}:\n"
+        "    __import__(name)\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {STARTUP_FORBIDDEN!r} if m in sys.modules]\n"
+        "print(elapsed, ','.join(loaded))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=APP_PATH.parent, check=True, capture_output=True, text=True
+    ).stdout.split()
+    return float(output[0]), output[1].split(",") if len(output) > 1 else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    modules = top_level_imports(APP_PATH)
+    eager = eager_lazy_imports(APP_PATH)
+    if eager:
+        print(f"FAIL: app.py imports {', '.join(eager)} at module level")
+        return 1
+
+    timings = []
+    for _ in range(args.runs):
+        elapsed, loaded = time_cold_import(modules)
+        if loaded:
+            print(f"FAIL: startup imports pulled in {', '.join(loaded)}")
+            return 1
+        timings.append(elapsed)
+
+    median = statistics.median(timings)
+    print(f"startup imports: {', '.join(sorted(modules))}")
+    print(f"cold import median: {median:.3f}s over {args.runs} runs (budget {args.budget:.3f}s)")
+    if median > args.budget:
+        print("FAIL: startup import budget exceeded")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
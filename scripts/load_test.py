@@ -0,0 +1,103 @@
+"""Load-test scenario for multi-process serving with a shared cache backend.
+
+Each worker process serves report requests one at a time, like an app worker
+blocking on a report: it checks the shared rate limiter and runs the real
+report pipeline (sb_char.pipeline) with the stubbed SearchAPI and OpenAI
+clients from sb_char.stubs, so search, parsing and the shared search/report
+caches are all exercised. Throughput is measured for increasing worker counts
+against the same backend. Streamlit and nginx are not involved; to load-test
+over HTTP, run the API workers and use scripts.load_test_api.
+
+Usage: python -m scripts.load_test [--workers 1,2,4] [--requests N]
+                                   [--search-latency SECONDS] [--llm-latency SECONDS]
+                                   [--repeat-ratio R] [--cache-url URL]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from sb_char.cache import RateLimiter, get_backend
+from sb_char.pipeline import ReportConfig, generate_report
+from sb_char.stubs import StubLLMClient, StubSearchClient
+
+
+def worker(cache_url, jobs, search_latency, llm_latency, results):
+    config = ReportConfig(cache=get_backend(cache_url), retry_delay=0)
+    limiter = RateLimiter(config.cache, limit=10**9, window=60)
+    search_client = StubSearchClient(latency=search_latency)
+    llm_client = StubLLMClient(latency=llm_latency)
+
+    async def serve():
+        hits = 0
+        while True:
+            player_name = await asyncio.to_thread(jobs.get)
+            if player_name is None:
+                return hits
+            limiter.allow("load-test")
+            events = []
+            await generate_report(
+                player_name, config=config, search_client=search_client,
+                llm_client=llm_client, on_progress=events.append,
+            )
+            hits += events[0].stage == "cached"
+
+    results.put(asyncio.run(serve()))
+
+
+def run(workers, requests, search_latency, llm_latency, cache_url, repeat_ratio):
+    """Serve `requests` report requests with `workers` processes and return (seconds, hits)"""
+    # A fraction of the requests repeat earlier players and should hit the cache
+    unique = max(1, int(requests * (1 - repeat_ratio)))
+    names = [f"player {workers}-{i % unique}" for i in range(requests)]
+
+    jobs = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    for name in names:
+        jobs.put(name)
+    for _ in range(workers):
+        jobs.put(None)
+
+    procs = [
+        multiprocessing.Process(target=worker, args=(cache_url, jobs, search_latency, llm_latency, results))
+        for _ in range(workers)
+    ]
+    start = time.perf_counter()
+    for proc in procs:
+        proc.start()
+    hits = sum(results.get() for _ in procs)
+    for proc in procs:
+        proc.join()
+    return time.perf_counter() - start, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--requests", type=int, default=80)
+    parser.add_argument("--search-latency", type=float, default=0.02)
+    parser.add_argument("--llm-latency", type=float, default=0.1)
+    parser.add_argument("--repeat-ratio", type=float, default=0.0)
+    parser.add_argument("--cache-url")
+    args = parser.parse_args()
+
+    cache_url = args.cache_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load_test.db')}"
+    if cache_url.startswith("memory://"):
+        parser.error("memory:// is per-process; use a sqlite:// or redis:// cache URL")
+
+    baseline = None
+    print(f"backend: {cache_url}")
+    print(f"{'workers':>7} {'seconds':>8} {'req/s':>8} {'hits':>5} {'scaling':>8}")
+    for workers in (int(n) for n in args.workers.split(",")):
+        elapsed, hits = run(workers, args.requests, args.search_latency, args.llm_latency, cache_url, args.repeat_ratio)
+        throughput = args.requests / elapsed
+        baseline = baseline or throughput / workers
+        print(f"{workers:>7} {elapsed:>8.2f} {throughput:>8.1f} {hits:>5} {throughput / (baseline * workers):>8.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
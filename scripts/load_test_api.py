@@ -0,0 +1,85 @@
+"""Load test for the report API (sb_char.api) against stubbed upstreams.
+
+Start the service first, e.g.:
+
+    SB_CHAR_STUB_UPSTREAMS=1 SB_CHAR_API_SECRET=... SB_CHAR_API_RATE_LIMIT=100000 \\
+        SB_CHAR_CACHE_URL=sqlite:///.sb_char_cache.db \\
+        uvicorn sb_char.api:app --port 8000 --workers 4
+
+Then fire concurrent batch requests and, optionally, revalidate the reports
+with If-None-Match to measure the 304 path.
+
+The client token comes from --token or SB_CHAR_API_TOKEN, or is issued
+locally when SB_CHAR_API_SECRET is set.
+
+Usage: python -m scripts.load_test_api [--url URL] [--token TOKEN] [--batches N]
+                                       [--batch-size N] [--concurrency N] [--revalidate]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+from sb_char.auth import issue_token
+
+
+async def run(url, token, batches, batch_size, concurrency, revalidate):
+    import httpx
+
+    run_id = uuid.uuid4().hex[:8]
+    limiter = asyncio.Semaphore(concurrency)
+    etags = {}
+
+    async def send_batch(client, i):
+        names = [f"player {run_id}-{i}-{j}" for j in range(batch_size)]
+        async with limiter:
+            response = await client.post("/reports/batch", json={"player_names": names})
+        response.raise_for_status()
+        for entry in response.json()["reports"]:
+            if "etag" in entry:
+                etags[entry["player_name"]] = entry["etag"]
+
+    async def revalidate_one(client, name, etag):
+        async with limiter:
+            response = await client.get(f"/reports/{name}", headers={"If-None-Match": etag})
+        return response.status_code == 304
+
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=url, headers=headers, timeout=600) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(send_batch(client, i) for i in range(batches)))
+        elapsed = time.perf_counter() - start
+        total = batches * batch_size
+        print(f"batch:      {total} reports in {elapsed:.2f}s ({total / elapsed:.1f} reports/s)")
+
+        if revalidate:
+            start = time.perf_counter()
+            results = await asyncio.gather(*(revalidate_one(client, n, e) for n, e in etags.items()))
+            elapsed = time.perf_counter() - start
+            print(f"revalidate: {len(results)} requests in {elapsed:.2f}s "
+                  f"({len(results) / elapsed:.1f} req/s, {sum(results)} not modified)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default=os.environ.get("SB_CHAR_API_TOKEN"))
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--revalidate", action="store_true")
+    args = parser.parse_args()
+
+    token = args.token
+    if not token and os.environ.get("SB_CHAR_API_SECRET"):
+        token = issue_token("load-test", os.environ["SB_CHAR_API_SECRET"].encode("utf-8"))
+    if not token:
+        parser.error("pass --token, or set SB_CHAR_API_TOKEN or SB_CHAR_API_SECRET")
+    asyncio.run(run(args.url, token, args.batches, args.batch_size, args.concurrency, args.revalidate))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Run several Streamlit workers that share one cache backend.
+
+Each worker is a separate `streamlit run app.py` process on its own port.
+Put them behind the load balancer in deploy/nginx.conf (sticky sessions are
+required because every Streamlit session is a websocket bound to one worker).
+That file lists DEFAULT_WORKERS upstreams; with a different --workers count,
+pass --nginx-conf to write a copy whose upstream list matches.
+
+Usage: python -m scripts.serve [--workers N] [--base-port PORT] [--cache-url URL]
+                               [--nginx-conf PATH]
+"""
+import argparse
+import os
+import re
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_URL = "sqlite:///.sb_char_cache.db"
+DEFAULT_WORKERS = 4  # matches the upstreams listed in deploy/nginx.conf
+NGINX_TEMPLATE = ROOT / "deploy" / "nginx.conf"
+UPSTREAM_SERVER = re.compile(r"^( *)server 127\.0\.0\.1:\d+;\n", re.MULTILINE)
+
+
+def write_nginx_conf(path, workers, base_port):
+    """Write deploy/nginx.conf with one upstream server per worker"""
+    template = NGINX_TEMPLATE.read_text()
+    # The template's upstream servers are consecutive lines; replace them as a block
+    matches = list(UPSTREAM_SERVER.finditer(template))
+    indent = matches[0].group(1)
+    servers = "".join(f"{indent}server 127.0.0.1:{base_port + i};\n" for i in range(workers))
+    conf = template[:matches[0].start()] + servers + template[matches[-1].end():]
+    Path(path).write_text(conf)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--base-port", type=int, default=8501)
+    parser.add_argument("--cache-url", default=os.environ.get("SB_CHAR_CACHE_URL", DEFAULT_CACHE_URL))
+    parser.add_argument("--nginx-conf", help="write an nginx config for these workers to PATH")
+    args = parser.parse_args()
+
+    if args.nginx_conf:
+        write_nginx_conf(args.nginx_conf, args.workers, args.base_port)
+        print(f"wrote {args.nginx_conf} with {args.workers} upstreams")
+    elif args.workers != DEFAULT_WORKERS or args.base_port != 8501:
+        print(f"note: deploy/nginx.conf lists {DEFAULT_WORKERS} workers from port 8501; "
+              "use --nginx-conf to generate a matching config")
+
+    if args.workers > 1 and args.cache_url.startswith("memory://"):
+        parser.error("memory:// is per-process; use a sqlite:// or redis:// cache URL for several workers")
+
+    env = dict(os.environ, SB_CHAR_CACHE_URL=args.cache_url)
+    procs = []
+    for i in range(args.workers):
+        port = args.base_port + i
+        procs.append(subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", "app.py",
+             "--server.port", str(port), "--server.headless", "true"],
+            cwd=ROOT, env=env,
+        ))
+        print(f"worker {i} listening on 127.0.0.1:{port}")
+
+    try:
+        for proc in procs:
+            proc.wait()
+    except KeyboardInterrupt:
+        for proc in procs:
+            proc.send_signal(signal.SIGTERM)
+        for proc in procs:
+            proc.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
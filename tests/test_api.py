@@ -0,0 +1,120 @@
+import functools
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+from sb_char import stubs
+from sb_char.auth import issue_token
+
+SECRET = "test-api-secret"
+RATE_LIMIT = 5
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("SB_CHAR_API_SECRET", SECRET)
+    monkeypatch.setenv("SB_CHAR_STUB_UPSTREAMS", "1")
+    monkeypatch.setenv("SB_CHAR_CACHE_URL", "memory://")
+    monkeypatch.setenv("SB_CHAR_API_RATE_LIMIT", str(RATE_LIMIT))
+    monkeypatch.setattr(stubs, "StubSearchClient", functools.partial(stubs.StubSearchClient, latency=0))
+    monkeypatch.setattr(stubs, "StubLLMClient", functools.partial(stubs.StubLLMClient, latency=0))
+    from sb_char.api import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def auth(name="alice"):
+    return {"Authorization": f"Bearer {issue_token(name, SECRET.encode('utf-8'))}"}
+
+
+def test_missing_or_invalid_token_is_rejected(client):
+    assert client.get("/reports/Josh Allen").status_code == 401
+    response = client.get("/reports/Josh Allen", headers={"Authorization": "Bearer not-a-token"})
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    other_secret = issue_token("alice", b"some-other-secret")
+    assert client.get("/reports/Josh Allen", headers={"Authorization": f"Bearer {other_secret}"}).status_code == 401
+
+
+def test_matching_if_none_match_returns_304(client):
+    first = client.get("/reports/Josh Allen", headers=auth())
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    revalidated = client.get("/reports/Josh Allen", headers={**auth(), "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+
+    stale = client.get("/reports/Josh Allen", headers={**auth(), "If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_batch_deduplicates_names_and_charges_once_per_name(client):
+    response = client.post("/reports/batch", headers=auth(),
+                           json={"player_names": ["Josh Allen", " josh allen", "Josh Allen", "Patrick Mahomes"]})
+    assert response.status_code == 200
+    assert [entry["player_name"] for entry in response.json()["reports"]] == ["Josh Allen", "Patrick Mahomes"]
+    # Two of the five reports per window used, so three more fit
+    names = ["Jalen Hurts", "Lamar Jackson", "Joe Burrow"]
+    assert client.post("/reports/batch", headers=auth(), json={"player_names": names}).status_code == 200
+
+
+def test_rate_limit_returns_429_without_using_up_quota(client):
+    names = ["Josh Allen", "Patrick Mahomes", "Jalen Hurts"]
+    assert client.post("/reports/batch", headers=auth(), json={"player_names": names}).status_code == 200
+
+    rejected = client.post("/reports/batch", headers=auth(),
+                           json={"player_names": ["Lamar Jackson", "Joe Burrow", "Justin Herbert"]})
+    assert rejected.status_code == 429
+    assert rejected.headers["Retry-After"]
+    # The rejected batch was refunded, so the last two reports still fit
+    assert client.get("/reports/Lamar Jackson", headers=auth()).status_code == 200
+    assert client.get("/reports/Joe Burrow", headers=auth()).status_code == 200
+    assert client.get("/reports/Justin Herbert", headers=auth()).status_code == 429
+    # Limits are per client
+    assert client.get("/reports/Justin Herbert", headers=auth("bob")).status_code == 200
+
+
+def test_batch_larger_than_the_limit_is_413(client):
+    names = [f"Player {i}" for i in range(RATE_LIMIT + 1)]
+    response = client.post("/reports/batch", headers=auth(), json={"player_names": names})
+    assert response.status_code == 413
+    assert "smaller batches" in response.json()["detail"]
+
+
+def wait_for_job(client, url, headers):
+    for _ in range(100):
+        job = client.get(url, headers=headers).json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job still {job['status']}")
+
+
+def test_job_runs_and_is_visible_only_to_its_client(client):
+    created = client.post("/jobs", headers=auth(), json={"player_names": ["Josh Allen", "Patrick Mahomes"]})
+    assert created.status_code == 202
+    url = created.json()["url"]
+
+    job = wait_for_job(client, url, auth())
+    assert job["status"] == "done"
+    assert job["completed"] == 2
+    assert sorted(entry["player_name"] for entry in job["results"]) == ["Josh Allen", "Patrick Mahomes"]
+
+    assert client.get(url, headers=auth("bob")).status_code == 404
+    assert client.get("/jobs/does-not-exist", headers=auth()).status_code == 404
+
+
+def test_job_without_heartbeat_is_reported_failed(client):
+    from sb_char.api import JOB_STALE_AFTER, _job_key
+    cache = client.app.state.config.cache
+    cache.set(_job_key("stale"), {"job_id": "stale", "client": "alice", "status": "running", "total": 1})
+    cache.set(_job_key("stale", "heartbeat"), time.time() - JOB_STALE_AFTER - 1)
+
+    job = client.get("/jobs/stale", headers=auth()).json()
+    assert job["status"] == "failed"
+    assert "stopped reporting progress" in job["error"]
@@ -0,0 +1,64 @@
+import base64
+import json
+
+import pytest
+
+from sb_char.auth import AuthConfig, hash_password, issue_token, verify_password, verify_token
+
+SECRET = b"test-secret"
+
+
+def test_hash_password_round_trip():
+    encoded = hash_password("hunter2")
+    assert encoded.startswith("scrypt$")
+    assert verify_password("hunter2", encoded)
+    assert not verify_password("hunter3", encoded)
+
+
+def test_hash_password_uses_a_fresh_salt():
+    assert hash_password("hunter2") != hash_password("hunter2")
+
+
+@pytest.mark.parametrize("encoded", ["", "not-a-hash", "bcrypt$1$2$3$4$5", "scrypt$1$2$3$4", "scrypt$x$8$1$c2FsdA$aGFzaA"])
+def test_verify_password_rejects_malformed_hashes(encoded):
+    assert not verify_password("hunter2", encoded)
+
+
+def test_token_round_trip():
+    assert verify_token(issue_token("analyst", SECRET), SECRET) == "analyst"
+
+
+def test_token_expires():
+    assert verify_token(issue_token("analyst", SECRET, ttl=-1), SECRET) is None
+
+
+def test_token_rejects_other_secret():
+    assert verify_token(issue_token("analyst", SECRET), b"other-secret") is None
+
+
+def test_token_rejects_tampered_payload():
+    payload, signature = issue_token("analyst", SECRET).split(".")
+    claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    claims["u"] = "admin"
+    forged = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    assert verify_token(f"{forged}.{signature}", SECRET) is None
+
+
+def test_token_rejects_tampered_signature():
+    token = issue_token("analyst", SECRET)
+    flipped = token[:-1] + ("A" if token[-1] != "A" else "B")
+    assert verify_token(flipped, SECRET) is None
+
+
+@pytest.mark.parametrize("token", [None, "", "no-dot", "a.b.c", ".", "abc.é", "é.abc", "abc.\udcff"])
+def test_token_rejects_malformed_tokens(token):
+    assert verify_token(token, SECRET) is None
+
+
+def test_auth_config_hashes_plaintext_password_once():
+    auth = AuthConfig.from_credentials({"username": "admin", "password": "password"}, session_secret="s")
+    assert auth.password_hash.startswith("scrypt$")
+    assert auth.check_password("admin", "password")
+    assert not auth.check_password("admin", "wrong")
+    assert not auth.check_password("someone", "password")
+    assert auth.verify_token(auth.issue_token("admin")) == "admin"
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sb_char.cache import MemoryBackend, RateLimiter, cache_key, get_backend
+
+REPORT = {"report": "x" * 1000, "sources": ["y" * 100] * 5}
+
+
+def churn(backend, entries=200):
+    for i in range(entries):
+        backend.set(cache_key("report", i), REPORT, ttl=3600)
+
+
+def test_report_churn_does_not_evict_revocations():
+    backend = MemoryBackend(max_bytes=200 * 1024)
+    backend.set(f"revoked-session:{cache_key('token')}", True, ttl=3600)
+    churn(backend)
+    assert backend.get(f"revoked-session:{cache_key('token')}") is True
+    assert backend.stats()["bytes"] <= backend.max_bytes
+
+
+def test_report_churn_does_not_reset_rate_limits():
+    backend = MemoryBackend(max_bytes=200 * 1024)
+    limiter = RateLimiter(backend, limit=2, window=60)
+    assert limiter.allow("alice")
+    assert limiter.allow("alice")
+    churn(backend)
+    assert not limiter.allow("alice")
+
+
+def test_counters_are_kept_outside_the_lru():
+    backend = MemoryBackend(max_bytes=200 * 1024)
+    assert backend.incr("job:1:completed") == 1
+    churn(backend)
+    assert backend.incr("job:1:completed") == 2
+    assert backend.stats()["control_entries"] == 1
+
+
+def test_control_entries_still_expire():
+    backend = MemoryBackend()
+    backend.set("revoked-session:abc", True, ttl=-1)
+    assert backend.get("revoked-session:abc") is None
+    assert backend.stats()["control_entries"] == 0
+
+
+def test_rejected_request_does_not_use_up_quota():
+    limiter = RateLimiter(MemoryBackend(), limit=120, window=60)
+    assert limiter.allow("alice", 30)
+    assert not limiter.allow("alice", 100)
+    assert limiter.allow("alice", 1)
+    assert limiter.allow("alice", 89)
+    assert not limiter.allow("alice", 1)
+
+
+@pytest.mark.parametrize("url", ["sqlite://", "sqlite:///", "sqlite:///:memory:"])
+def test_sqlite_url_without_a_file_is_rejected(url):
+    with pytest.raises(ValueError, match="file path"):
+        get_backend(url)
+
+
+def test_sqlite_backend_is_shared_across_threads(tmp_path):
+    backend = get_backend(f"sqlite:///{tmp_path / 'cache.db'}")
+    backend.set("key", {"a": 1})
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert pool.submit(backend.get, "key").result() == {"a": 1}
+
+
+def test_memory_backend_stays_under_max_bytes():
+    backend = MemoryBackend(max_bytes=50 * 1024)
+    for i in range(500):
+        backend.set(f"key-{i}", "v" * (i % 7 * 500), ttl=3600)
+        assert backend.stats()["bytes"] <= backend.max_bytes
+    # Least recently used keys went first; the newest is still there
+    assert backend.get("key-0") is None
+    assert backend.get("key-499") == "v" * (499 % 7 * 500)
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_bytes=50 * 1024)
+    backend.set("old", "x" * 1000)
+    backend.set("touched", "x" * 1000)
+    for i in range(60):
+        backend.get("touched")
+        backend.set(f"key-{i}", "x" * 1000)
+    assert backend.get("old") is None
+    assert backend.get("touched") == "x" * 1000
+
+
+def test_memory_backend_skips_values_larger_than_the_cap():
+    backend = MemoryBackend(max_bytes=1024)
+    backend.set("small", "x")
+    backend.set("huge", "x" * 4096)
+    assert backend.get("huge") is None
+    assert backend.get("small") == "x"
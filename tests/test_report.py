@@ -0,0 +1,77 @@
+from sb_char.analysis import CATEGORIES
+from sb_char.report import ReportStore
+
+
+def results(tag, count=5):
+    return [
+        {'title': f"{tag} title {i}", 'link': f"https://example.com/{tag}/{i}",
+         'snippet': f"{tag} snippet {i} " * 10, 'source': "news" if i % 2 else "general"}
+        for i in range(count)
+    ]
+
+
+def report_dict(summary, sources):
+    return {
+        'overall_score': 80,
+        'score_explanation': "Solid.",
+        'category_scores': {category: {"score": 80, "explanation": "Fine."} for category in CATEGORIES},
+        'executive_summary': summary,
+        'details': {"strengths": "Many.", "concerns": "Few."},
+        'raw_data': sources,
+    }
+
+
+def test_round_trip():
+    store = ReportStore()
+    original = report_dict("Summary A", results("a"))
+    key = store.put("Josh Allen", original)
+    assert store.get(key).to_dict() == original
+    assert store.put("Josh Allen", original) == key
+    assert store.stats()["reports"] == 1
+
+
+def test_identical_sources_are_shared_and_counted_once():
+    store = ReportStore()
+    first = store.get(store.put("Josh Allen", report_dict("Summary A", results("a"))))
+    second = store.get(store.put("Josh Allen", report_dict("Summary B", results("a"))))
+
+    assert first is not second
+    assert first.sources is second.sources
+    stats = store.stats()
+    assert stats["reports"] == 2
+    assert stats["sources"] == 1
+    assert stats["bytes"] == first.nbytes() + second.nbytes() + first.sources.nbytes()
+
+
+def test_shared_sources_are_freed_only_with_their_last_report():
+    # Budget for exactly two reports with two distinct source sets
+    probe = ReportStore()
+    probe.put("Player B", report_dict("Summary B", results("a")))
+    probe.put("Player C", report_dict("Summary C", results("c")))
+    store = ReportStore(max_bytes=probe.stats()["bytes"])
+
+    key_a = store.put("Player A", report_dict("Summary A", results("a")))
+    key_b = store.put("Player B", report_dict("Summary B", results("a")))
+    shared = store.get(key_b).sources
+    key_c = store.put("Player C", report_dict("Summary C", results("c")))
+    # A is evicted, but B still uses the shared columns
+    assert store.get(key_a) is None
+    assert store.stats()["sources"] == 2
+
+    key_d = store.put("Player D", report_dict("Summary D", results("d")))
+    # B was the last report using the shared columns, so they go with it
+    assert store.get(key_b) is None
+    stats = store.stats()
+    assert stats["reports"] == 2
+    assert stats["sources"] == 2
+    assert stats["bytes"] == store.nbytes(key_c) + store.nbytes(key_d) <= stats["max_bytes"]
+    assert store.get(key_c).sources is not shared and store.get(key_d).sources is not shared
+
+
+def test_most_recent_report_is_kept_even_over_budget():
+    store = ReportStore(max_bytes=1)
+    key_a = store.put("Player A", report_dict("Summary A", results("a")))
+    key_b = store.put("Player B", report_dict("Summary B", results("b")))
+    assert store.get(key_a) is None
+    assert store.get(key_b) is not None
+    assert store.stats()["bytes"] == store.nbytes(key_b)
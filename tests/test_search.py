@@ -0,0 +1,99 @@
+import asyncio
+
+from sb_char.pipeline import ReportConfig
+from sb_char.search import CATEGORY_KEYWORDS, adaptive_search, is_relevant, surname
+from sb_char.stubs import StubSearchClient
+
+TOPICS = [keywords[0] for keywords in CATEGORY_KEYWORDS.values()]
+
+
+class CountingClient:
+    """Pages of up to `page_results` results per kind; only `relevant_per_page` of them name the player"""
+
+    def __init__(self, available=50, relevant_per_page=10, with_topics=True, page_results=None):
+        self.available = available
+        self.page_results = page_results
+        self.relevant_per_page = relevant_per_page
+        self.with_topics = with_topics
+        self.queries = []
+
+    async def query(self, player_name, kind, page=1, num_results=10):
+        self.queries.append((kind, page))
+        start = (page - 1) * num_results
+        results = []
+        count = self.page_results or num_results
+        for i in range(start, min(start + count, self.available)):
+            who = player_name if i % num_results < self.relevant_per_page else "someone else"
+            topic = " ".join(TOPICS) if self.with_topics else "news"
+            results.append({
+                'title': f"{who} {kind} {i}",
+                'link': f"https://example.com/{kind}/{i}",
+                'snippet': f"{who}: {topic}",
+                'source': kind,
+            })
+        return results
+
+
+def run(client, **config):
+    return asyncio.run(adaptive_search("Patrick Mahomes", config=ReportConfig(**config), client=client))
+
+
+def test_well_covered_player_stops_after_first_round():
+    client = CountingClient()
+    results = run(client)
+    assert len(client.queries) == 2
+    assert len(results) == 20
+
+
+def test_stub_client_stops_after_first_round():
+    client = StubSearchClient(latency=0)
+    results = run(client)
+    assert len(results) == 20
+
+
+def test_empty_page_marks_query_exhausted():
+    client = CountingClient(available=4, with_topics=False)
+    results = run(client)
+    assert client.queries == [("general", 1), ("news", 1), ("general", 2), ("news", 2)]
+    assert len(results) == 8
+
+
+def test_short_pages_keep_paging_while_categories_are_thin():
+    client = CountingClient(relevant_per_page=3, with_topics=False, page_results=9)
+    results = run(client)
+    # 6 relevant with thin categories after round one, the target after round two
+    assert len(client.queries) == 4
+    assert len(results) == 12
+
+
+def test_low_count_with_covered_categories_stops_at_min_results():
+    client = CountingClient(relevant_per_page=2)
+    run(client)
+    # 4 relevant after round one, 8 (>= search_min_results) after round two
+    assert len(client.queries) == 4
+
+
+def test_low_count_with_thin_categories_pages_until_target():
+    client = CountingClient(relevant_per_page=2, with_topics=False)
+    results = run(client)
+    assert len(client.queries) == 6
+    assert len(results) == 12
+
+
+def test_surname_skips_suffixes():
+    assert surname("Odell Beckham Jr.") == "beckham"
+    assert surname("Robert Griffin III") == "griffin"
+    assert surname("Patrick Mahomes") == "mahomes"
+
+
+def test_is_relevant_does_not_match_on_suffix():
+    assert not is_relevant({'title': "Jr. high football recap", 'snippet': ""}, "Odell Beckham Jr.")
+    assert is_relevant({'title': "Beckham signs", 'snippet': ""}, "Odell Beckham Jr.")
+
+
+def test_is_relevant_matches_whole_words_only():
+    assert not is_relevant({'title': "Forward thinking offense", 'snippet': ""}, "Darius Ward")
+    assert not is_relevant({'title': "Hilltop high school", 'snippet': ""}, "Tyreek Hill")
+    assert is_relevant({'title': "Hill's 80-yard touchdown", 'snippet': ""}, "Tyreek Hill")
+    assert is_relevant({'title': "", 'snippet': "Signed with Ward, the Jets said."}, "Darius Ward")
+    assert is_relevant({'title': "St. Brown catches two", 'snippet': ""}, "Amon-Ra St. Brown")
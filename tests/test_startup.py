@@ -0,0 +1,18 @@
+import pytest
+
+from scripts import bench_startup
+
+
+def test_app_imports_no_heavy_sdk_at_module_level():
+    assert bench_startup.eager_lazy_imports(bench_startup.APP_PATH) == []
+
+
+def test_eager_sdk_import_is_detected(tmp_path):
+    app = tmp_path / "app.py"
+    app.write_text("import streamlit as st\nfrom openai import AsyncOpenAI\n\ndef f():\n    import pandas\n")
+    assert bench_startup.eager_lazy_imports(app) == ["openai"]
+
+
+def test_startup_import_budget():
+    pytest.importorskip("streamlit")
+    assert bench_startup.main(["--runs", "3"]) == 0